@@ -8,17 +8,25 @@ import sys
 import os
 import re
 import json
+import logging
+import importlib.util
 import asyncio
+import contextvars
 import queue
+import hashlib
 import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from dataclasses import dataclass, field
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional, Dict, List, Generator
 from pathlib import Path
-from contextlib import redirect_stdout
-import io
 
 from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, FileResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -26,33 +34,73 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # =============================================================================
 # APP CONFIGURATION
 # =============================================================================
-app = FastAPI(title="Dell Brazil Tax Legislation Analysis", version="5.3")
+app = FastAPI(title="Dell Brazil Tax Legislation Analysis", version="5.3",
+              default_response_class=ORJSONResponse)
 templates = Jinja2Templates(directory="templates")
 
 OUTPUT_DIR = "/mnt/user-data/outputs"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# Global queue for streaming logs
-log_queues: Dict[str, queue.Queue] = {}
+# Report filenames written to OUTPUT_DIR; /download only serves these
+_PRODUCED_FILES: set = set()
+
+# Global queue for streaming logs (SimpleQueue: lock-free put/get)
+log_queues: Dict[str, queue.SimpleQueue] = {}
+
+# Workflow/monitor runs are blocking (HTTP + LLM); they go to this many threads
+MAX_WORKER_THREADS = 8
+
+# SSE log stream: lines are batched and flushed every interval or every N lines
+SSE_FLUSH_INTERVAL = 0.05  # seconds
+SSE_FLUSH_LINES = 16
+# A stream opened before /analyze attaches its session waits this long, then ends
+SSE_ATTACH_TIMEOUT = 10.0  # seconds
+
+# Session of the analysis running in the current context. asyncio.to_thread copies
+# the context, so workflow log records are emitted with the requesting session set.
+_log_session: contextvars.ContextVar = contextvars.ContextVar("log_session", default=None)
 
 # =============================================================================
 # MODULE IMPORTS
+# workflow/brazil_monitor (openai, httpx, bs4, langgraph...) are only located
+# here and imported on first use, keeping cold start and idle memory low
 # =============================================================================
-HAS_WORKFLOW = False
-HAS_BRAZIL_MONITOR = False
+def _missing_modules(*names: str) -> List[str]:
+    return [name for name in names if importlib.util.find_spec(name) is None]
 
-try:
+
+_missing = _missing_modules("dotenv", "config", "openai", "langgraph", "workflow")
+HAS_WORKFLOW = not _missing
+if HAS_WORKFLOW:
     from config import validate_config, DEV_GENAI_API_KEY
-    from workflow import LegislacaoWorkflow
-    HAS_WORKFLOW = True
-except ImportError as e:
-    print(f"⚠️ Workflow not available: {e}")
+else:
+    print(f"⚠️ Workflow not available: missing {', '.join(_missing)}")
+
+_missing = _missing_modules("dotenv", "openai", "httpx", "bs4", "brazil_monitor")
+HAS_BRAZIL_MONITOR = not _missing
+if not HAS_BRAZIL_MONITOR:
+    print(f"⚠️ Brazil Monitor not available: missing {', '.join(_missing)}")
+
+_workflow_cls = None
+_monitor_cls = None
 
-try:
-    from brazil_monitor import BrazilMonitor
-    HAS_BRAZIL_MONITOR = True
-except ImportError as e:
-    print(f"⚠️ Brazil Monitor not available: {e}")
+
+def get_workflow_cls():
+    """Imports LegislacaoWorkflow on first call"""
+    global _workflow_cls
+    if _workflow_cls is None:
+        from workflow import LegislacaoWorkflow
+        _workflow_cls = LegislacaoWorkflow
+    return _workflow_cls
+
+
+def get_monitor_cls():
+    """Imports BrazilMonitor on first call"""
+    global _monitor_cls
+    if _monitor_cls is None:
+        from brazil_monitor import BrazilMonitor
+        _monitor_cls = BrazilMonitor
+    return _monitor_cls
 
 # =============================================================================
 # TRANSLATIONS
@@ -126,191 +174,455 @@ TRANSLATIONS = {
     }
 }
 
-def get_translations(lang: str = "en") -> Dict:
-    return TRANSLATIONS.get(lang, TRANSLATIONS["en"])
+# Template context fields that never change per request, built once per language
+_BASE_CTX = {
+    lang: MappingProxyType({
+        "t": TRANSLATIONS[lang],
+        "lang": lang,
+        "workflow_available": HAS_WORKFLOW,
+        "monitor_available": HAS_BRAZIL_MONITOR,
+    })
+    for lang in TRANSLATIONS
+}
+
+
+def base_context(lang: str = "en") -> MappingProxyType:
+    return _BASE_CTX[lang if lang in _BASE_CTX else "en"]
 
 
 # =============================================================================
-# LOG CAPTURE CLASS
+# LOG STREAMING HANDLER
 # =============================================================================
-class LogCapture:
-    """Captures print output and sends to queue"""
+class SessionLogFilter(logging.Filter):
+    """Passes only records emitted while the given session's analysis is running"""
     def __init__(self, session_id: str):
+        super().__init__()
         self.session_id = session_id
-        self.original_stdout = sys.stdout
+    
+    def filter(self, record) -> bool:
+        return _log_session.get() == self.session_id
+
+
+class SSEHandler(logging.Handler):
+    """
+    Sends each workflow log record (one complete message) to the session queue.
+    Only the "workflow" logger is streamed: agents that print() still write to the
+    server console, not to the SSE stream.
+    """
+    def __init__(self, session_id: str):
+        super().__init__()
+        self.session_id = session_id
+        self.context_token = None
+        self.addFilter(SessionLogFilter(session_id))
+    
+    def emit(self, record):
+        q = log_queues.get(self.session_id)
+        if q is not None:
+            q.put_nowait(self.format(record))
+
+
+def attach_log_stream(session_id: str) -> SSEHandler:
+    """
+    Creates the session queue, tags the current context with the session and
+    attaches an SSEHandler to the workflow logger. Only this function creates queues.
+    """
+    log_queues.setdefault(session_id, queue.SimpleQueue())
+    handler = SSEHandler(session_id)
+    handler.context_token = _log_session.set(session_id)
+    logging.getLogger("workflow").addHandler(handler)
+    return handler
+
+
+def detach_log_stream(handler: SSEHandler):
+    """Removes the handler, untags the context and drops the session queue"""
+    logging.getLogger("workflow").removeHandler(handler)
+    _log_session.reset(handler.context_token)
+    log_queues.pop(handler.session_id, None)
+
+
+def _sse_event(lines: List[str]) -> str:
+    return "".join(f"data: {line}\n" for line in "\n".join(lines).split("\n")) + "\n"
+
+
+def log_event_stream(session_id: str) -> Generator[str, None, None]:
+    """
+    Yields batched SSE events for a session until its queue is detached and drained.
+    If the session has no queue (unknown id, analysis already finished, or /analyze
+    not started) it waits up to SSE_ATTACH_TIMEOUT and then just sends "done".
+    Runs in Starlette's threadpool (sync generator), so the blocking waits are fine.
+    """
+    deadline = time.monotonic() + SSE_ATTACH_TIMEOUT
+    q = log_queues.get(session_id)
+    while q is None and time.monotonic() < deadline:
+        time.sleep(SSE_FLUSH_INTERVAL)
+        q = log_queues.get(session_id)
+    if q is None:
+        yield "event: done\ndata: \n\n"
+        return
+    
+    buffer = []
+    last_flush = time.monotonic()
+    
+    while True:
+        try:
+            buffer.append(q.get(timeout=SSE_FLUSH_INTERVAL))
+        except queue.Empty:
+            if not buffer and log_queues.get(session_id) is not q:
+                break
         
-    def write(self, text):
-        self.original_stdout.write(text)
-        if text.strip() and self.session_id in log_queues:
-            log_queues[self.session_id].put(text)
+        now = time.monotonic()
+        if buffer and (len(buffer) >= SSE_FLUSH_LINES or now - last_flush >= SSE_FLUSH_INTERVAL):
+            yield _sse_event(buffer)
+            buffer = []
+            last_flush = now
     
-    def flush(self):
-        self.original_stdout.flush()
+    yield "event: done\ndata: \n\n"
+
+
+# =============================================================================
+# REPORT PARSING PATTERNS
+# Compiled once at import; parse_analysis_report runs on every analysis
+# =============================================================================
+_RE_TYPE = re.compile(r'🏛️\s*(.+?)(?:\n|$)')
+_RE_NUMBER = re.compile(r'📄\s*(.+?)(?:\n|$)')
+_RE_DATE = re.compile(r'📅\s*Data:\s*(.+?)(?:\n|$)')
+_RE_RELEVANCE = re.compile(r'RELEVÂNCIA\s*(?:PARA\s*)?DELL[:\s]*\*?\*?\s*(ALTA|MÉDIA|MEDIA|BAIXA|HIGH|MEDIUM|LOW)', re.IGNORECASE)
+_RE_JUSTIFICATION = re.compile(r'Justificativa[:\s]*(.*?)(?:\n\n|={3,})', re.DOTALL | re.IGNORECASE)
+_RE_JUSTIFICATION_BODY = re.compile(r'Justificativa[:\s]*(.*?)(?:\n\n|\Z)', re.DOTALL | re.IGNORECASE)
+_TRIBUTES = r'IPI|ICMS|PIS|COFINS|IRPJ|CSLL|ISS|IOF|II|CBS|IBS|IS|CIDE'
+_RE_TAX_TRIBUTE = re.compile(rf'({_TRIBUTES}|IE)[:\s•\-]+([^\n•]+(?:\n(?![A-Z]{{2,}})[^\n•]+)*)')
+_RE_TAX_BULLET = re.compile(rf'[•-]\s*(({_TRIBUTES})[^•\n]+)')
+_RE_TAX_MENTION = re.compile(r'(IPI|ICMS|PIS|COFINS|IRPJ|CSLL|CBS|IBS)[:\s]+([^•\n]+)')
+_RE_SOURCE_BLOCK = re.compile(r'\d+\.\s*(.+?)\n\s*URL:\s*(\S+)')
+_RE_YEAR_ITEM = re.compile(r'(202\d)[:\s-]+(.+?)(?=\n202|\n\n|$)', re.DOTALL)
+_RE_BULLET = re.compile(r'[•-]\s*(.+?)(?=\n[•-]|\n\n|$)')
+_RE_WHITESPACE = re.compile(r'\s+')
+
+# The report is split once on its ==== delimiters; each section heading is the
+# last line before a delimiter and its body is the following segment.
+# (key, heading pattern for that line, marker that ends the body early:
+#  a plain string is cut with str.partition, a pattern only where needed)
+_RE_SECTION_DELIMITER = re.compile(r'={3,}')
+_REPORT_SECTIONS = (
+    ("executive_summary", r'RESUMO EXECUTIVO', '2️⃣'),
+    ("fiscal_changes", r'ALTERAÇÕES\s*FISCAIS', '3️⃣'),
+    ("system_changes", r'MUDANÇAS.*?SISTEMA', '4️⃣'),
+    ("tax_impact", r'IMPACTO.*?TRIBUT[AÁ]RIO', re.compile(r'5️⃣|CRONOGRAMA', re.IGNORECASE)),
+    ("deadlines", r'PRAZOS.*?CR[ÍI]TICOS', '6️⃣'),
+    ("compliance_risks", r'RISCOS.*?COMPLIANCE', '7️⃣'),
+    ("sources", r'FONTES\s*CONSULTADAS', '⚙️'),
+    ("transition_schedule", r'CRONOGRAMA.*?TRANSIÇÃO', re.compile(r'\d️⃣')),
+)
+# All headings in one alternation: the anchored endings are distinct, so at most
+# one group can match a line and a single search replaces a per-section loop
+_RE_SECTION_HEADING = re.compile(
+    "|".join(f"(?P<{key}>{pattern})$" for key, pattern, _ in _REPORT_SECTIONS), re.IGNORECASE
+)
+_SECTION_END = {key: end for key, _, end in _REPORT_SECTIONS}
+# Last word of every heading (upper-cased): one str.endswith call rules out body lines
+_SECTION_HEADING_ENDINGS = (
+    "EXECUTIVO", "FISCAIS", "SISTEMA", "TRIBUTARIO", "TRIBUTÁRIO", "CRITICOS", "CRÍTICOS",
+    "COMPLIANCE", "CONSULTADAS", "TRANSIÇÃO",
+)
+
+
+def _split_report_sections(report: str) -> tuple:
+    """
+    Splits the report once on ==== delimiters.
+
+    Returns (preamble, bodies) where preamble is the text before the first known
+    section and bodies maps each section key to its raw segment (first occurrence).
+    """
+    segments = _RE_SECTION_DELIMITER.split(report)
+    bodies = {}
+    preamble = None
+
+    for i in range(len(segments) - 1):
+        heading = segments[i].rstrip().rpartition('\n')[2]
+        if not heading.upper().endswith(_SECTION_HEADING_ENDINGS):
+            continue
+        match = _RE_SECTION_HEADING.search(heading)
+        if match and match.lastgroup not in bodies:
+            bodies[match.lastgroup] = segments[i + 1]
+            if preamble is None:
+                preamble = "\n".join(segments[:i + 1])
+
+    return (report if preamble is None else preamble), bodies
+
+
+def _section(bodies: dict, key: str) -> str:
+    """Returns the section body cut at its end marker, or None if absent"""
+    body = bodies.get(key)
+    if body is None:
+        return None
+    end = _SECTION_END[key]
+    if isinstance(end, str):
+        return body.partition(end)[0]
+    return end.split(body, 1)[0]
+
+
+def _extract_tax_impact(tax_body: Optional[str], system_body: Optional[str]) -> List[Dict]:
+    """
+    Tribute impacts from the tax section; each fallback only runs if the previous found nothing:
+    tribute details -> tax-name bullets -> tribute mentions in the (raw) system changes section
+    """
+    impact = []
+    
+    if tax_body is not None:
+        # Try to find specific tribute mentions with details
+        for tribute, details in _RE_TAX_TRIBUTE.findall(tax_body):
+            clean_details = _RE_WHITESPACE.sub(' ', details.strip())[:300]
+            if clean_details:
+                impact.append({"tribute": tribute.strip(), "details": clean_details})
+        if impact:
+            return impact
+        
+        # Also look for bullet points with tax names
+        for item, tax_name in _RE_TAX_BULLET.findall(tax_body):
+            impact.append({"tribute": tax_name, "details": item[len(tax_name):].strip()[:300]})
+        if impact:
+            return impact
+    
+    if system_body is not None:
+        for match in islice(_RE_TAX_MENTION.finditer(system_body), 6):
+            tribute, details = match.groups()
+            impact.append({"tribute": tribute.strip(), "details": details.strip()[:200]})
+    
+    return impact
 
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
-def parse_analysis_report(report: str) -> Dict:
+@dataclass(slots=True)
+class ParsedReport:
+    """Structured sections of an analysis report (see parse_analysis_report)"""
+    raw_report: str = ""
+    header: Dict = field(default_factory=dict)
+    executive_summary: str = ""
+    relevance: str = "MEDIUM"
+    relevance_class: str = "medium"
+    justification: str = ""
+    fiscal_changes: List[str] = field(default_factory=list)
+    system_changes: List[str] = field(default_factory=list)
+    tax_impact: List[Dict] = field(default_factory=list)
+    deadlines: List[str] = field(default_factory=list)
+    compliance_risks: List[str] = field(default_factory=list)
+    actions: Dict = field(default_factory=lambda: {"main": "", "technical": [], "fiscal": []})
+    sources: List[Dict] = field(default_factory=list)
+    transition_schedule: List[Dict] = field(default_factory=list)
+    saved_file: str = ""
+    
+    def as_dict(self) -> Dict:
+        """Shallow dict for the template context (no deep copy like dataclasses.asdict)"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def parse_analysis_report(report: str) -> ParsedReport:
     """Parse the analysis report into structured sections"""
-    sections = {
-        "header": {},
-        "executive_summary": "",
-        "relevance": "MEDIUM",
-        "relevance_class": "medium",
-        "justification": "",
-        "fiscal_changes": [],
-        "system_changes": [],
-        "tax_impact": [],
-        "deadlines": [],
-        "compliance_risks": [],
-        "actions": {"main": "", "technical": [], "fiscal": []},
-        "sources": [],
-        "transition_schedule": [],
-        "raw_report": report
-    }
+    parsed = ParsedReport(raw_report=report)
     
     if not report:
-        return sections
+        return parsed
+    
+    preamble, bodies = _split_report_sections(report)
     
     # Extract header info
-    type_match = re.search(r'🏛️\s*(.+?)(?:\n|$)', report)
+    type_match = _RE_TYPE.search(preamble)
     if type_match:
-        sections["header"]["type"] = type_match.group(1).strip()
+        parsed.header["type"] = type_match.group(1).strip()
     
-    number_match = re.search(r'📄\s*(.+?)(?:\n|$)', report)
+    number_match = _RE_NUMBER.search(preamble)
     if number_match:
-        sections["header"]["number"] = number_match.group(1).strip()
+        parsed.header["number"] = number_match.group(1).strip()
     
-    date_match = re.search(r'📅\s*Data:\s*(.+?)(?:\n|$)', report)
+    date_match = _RE_DATE.search(preamble)
     if date_match:
-        sections["header"]["date"] = date_match.group(1).strip()
+        parsed.header["date"] = date_match.group(1).strip()
+    
+    exec_body = _section(bodies, "executive_summary")
     
-    # Extract relevance
-    relevance_match = re.search(r'RELEVÂNCIA\s*(?:PARA\s*)?DELL[:\s]*\*?\*?\s*(ALTA|MÉDIA|MEDIA|BAIXA|HIGH|MEDIUM|LOW)', report, re.IGNORECASE)
+    # Extract relevance (usually inside the executive summary)
+    relevance_match = (exec_body and _RE_RELEVANCE.search(exec_body)) or _RE_RELEVANCE.search(report)
     if relevance_match:
         rel = relevance_match.group(1).upper()
         if rel in ["ALTA", "HIGH"]:
-            sections["relevance"] = "HIGH"
-            sections["relevance_class"] = "high"
+            parsed.relevance = "HIGH"
+            parsed.relevance_class = "high"
         elif rel in ["MÉDIA", "MEDIA", "MEDIUM"]:
-            sections["relevance"] = "MEDIUM"
-            sections["relevance_class"] = "medium"
+            parsed.relevance = "MEDIUM"
+            parsed.relevance_class = "medium"
         else:
-            sections["relevance"] = "LOW"
-            sections["relevance_class"] = "low"
+            parsed.relevance = "LOW"
+            parsed.relevance_class = "low"
     
     # Extract executive summary
-    exec_match = re.search(r'RESUMO EXECUTIVO\s*={3,}(.*?)(?:={3,}|2️⃣)', report, re.DOTALL | re.IGNORECASE)
-    if exec_match:
-        sections["executive_summary"] = exec_match.group(1).strip()
+    if exec_body is not None:
+        parsed.executive_summary = exec_body.strip()
     
     # Extract justification
-    just_match = re.search(r'Justificativa[:\s]*(.*?)(?:\n\n|={3,})', report, re.DOTALL | re.IGNORECASE)
+    just_match = (exec_body and _RE_JUSTIFICATION_BODY.search(exec_body)) or _RE_JUSTIFICATION.search(report)
     if just_match:
-        sections["justification"] = just_match.group(1).strip()[:300]
+        parsed.justification = just_match.group(1).strip()[:300]
     
     # Extract fiscal changes
-    fiscal_match = re.search(r'ALTERAÇÕES\s*FISCAIS\s*={3,}(.*?)(?:={3,}|3️⃣)', report, re.DOTALL | re.IGNORECASE)
-    if fiscal_match:
-        items = re.findall(r'[•-]\s*(.+?)(?=\n[•-]|\n\n|$)', fiscal_match.group(1))
-        sections["fiscal_changes"] = [i.strip() for i in items[:8] if i.strip()]
+    fiscal_body = _section(bodies, "fiscal_changes")
+    if fiscal_body is not None:
+        items = _RE_BULLET.findall(fiscal_body)
+        parsed.fiscal_changes = [i.strip() for i in items[:8] if i.strip()]
     
     # Extract system changes
-    system_match = re.search(r'MUDANÇAS.*?SISTEMA\s*={3,}(.*?)(?:={3,}|4️⃣)', report, re.DOTALL | re.IGNORECASE)
-    if system_match:
-        items = re.findall(r'[•-]\s*(.+?)(?=\n[•-]|\n\n|$)', system_match.group(1))
-        sections["system_changes"] = [i.strip() for i in items[:8] if i.strip()]
-    
-    # Extract tax impact - Enhanced extraction
-    tax_match = re.search(r'IMPACTO.*?TRIBUT[AÁ]RIO\s*={3,}(.*?)(?:={3,}|5️⃣|CRONOGRAMA)', report, re.DOTALL | re.IGNORECASE)
-    if tax_match:
-        tax_content = tax_match.group(1)
-        # Try to find specific tribute mentions with details
-        tributes = re.findall(r'(IPI|ICMS|PIS|COFINS|IRPJ|CSLL|ISS|IOF|II|IE|CBS|IBS|IS|CIDE)[:\s•\-]+([^\n•]+(?:\n(?![A-Z]{2,})[^\n•]+)*)', tax_content)
-        for tribute, details in tributes:
-            clean_details = re.sub(r'\s+', ' ', details.strip())[:300]
-            if clean_details:
-                sections["tax_impact"].append({"tribute": tribute.strip(), "details": clean_details})
-        
-        # Also look for bullet points with tax names
-        if not sections["tax_impact"]:
-            items = re.findall(r'[•-]\s*((?:IPI|ICMS|PIS|COFINS|IRPJ|CSLL|ISS|IOF|II|CBS|IBS|IS|CIDE)[^•\n]+)', tax_content)
-            for item in items:
-                tax_name = re.match(r'(IPI|ICMS|PIS|COFINS|IRPJ|CSLL|ISS|IOF|II|CBS|IBS|IS|CIDE)', item)
-                if tax_name:
-                    sections["tax_impact"].append({
-                        "tribute": tax_name.group(1),
-                        "details": item[len(tax_name.group(1)):].strip()[:300]
-                    })
-    
-    # Also check for tax mentions in system changes section
-    if not sections["tax_impact"]:
-        system_section = re.search(r'MUDANÇAS.*?SISTEMA\s*={3,}(.*?)(?:={3,})', report, re.DOTALL | re.IGNORECASE)
-        if system_section:
-            tax_mentions = re.findall(r'(IPI|ICMS|PIS|COFINS|IRPJ|CSLL|CBS|IBS)[:\s]+([^•\n]+)', system_section.group(1))
-            for tribute, details in tax_mentions[:6]:
-                sections["tax_impact"].append({"tribute": tribute.strip(), "details": details.strip()[:200]})
+    system_body = _section(bodies, "system_changes")
+    if system_body is not None:
+        items = _RE_BULLET.findall(system_body)
+        parsed.system_changes = [i.strip() for i in items[:8] if i.strip()]
+    
+    # Extract tax impact - Enhanced extraction (system section used without its end marker)
+    parsed.tax_impact = _extract_tax_impact(_section(bodies, "tax_impact"), bodies.get("system_changes"))
     
     # Extract deadlines
-    deadline_match = re.search(r'PRAZOS.*?CR[ÍI]TICOS\s*={3,}(.*?)(?:={3,}|6️⃣)', report, re.DOTALL | re.IGNORECASE)
-    if deadline_match:
-        items = re.findall(r'[•-]\s*(.+?)(?=\n[•-]|\n\n|$)', deadline_match.group(1))
-        sections["deadlines"] = [i.strip() for i in items[:6] if i.strip()]
+    deadline_body = _section(bodies, "deadlines")
+    if deadline_body is not None:
+        items = _RE_BULLET.findall(deadline_body)
+        parsed.deadlines = [i.strip() for i in items[:6] if i.strip()]
     
     # Extract compliance risks
-    risk_match = re.search(r'RISCOS.*?COMPLIANCE\s*={3,}(.*?)(?:={3,}|7️⃣)', report, re.DOTALL | re.IGNORECASE)
-    if risk_match:
-        items = re.findall(r'[•-]\s*(.+?)(?=\n[•-]|\n\n|$)', risk_match.group(1))
-        sections["compliance_risks"] = [i.strip() for i in items[:6] if i.strip()]
+    risk_body = _section(bodies, "compliance_risks")
+    if risk_body is not None:
+        items = _RE_BULLET.findall(risk_body)
+        parsed.compliance_risks = [i.strip() for i in items[:6] if i.strip()]
     
     # Extract sources
-    sources_match = re.search(r'FONTES\s*CONSULTADAS\s*={3,}(.*?)(?:={3,}|⚙️)', report, re.DOTALL | re.IGNORECASE)
-    if sources_match:
-        source_blocks = re.findall(r'\d+\.\s*(.+?)\n\s*URL:\s*(\S+)', sources_match.group(1))
+    sources_body = _section(bodies, "sources")
+    if sources_body is not None:
+        source_blocks = _RE_SOURCE_BLOCK.findall(sources_body)
         for title, url in source_blocks[:5]:
-            sections["sources"].append({"title": title.strip(), "url": url.strip()})
+            parsed.sources.append({"title": title.strip(), "url": url.strip()})
     
     # Extract transition schedule
-    transition_match = re.search(r'CRONOGRAMA.*?TRANSIÇÃO\s*={3,}(.*?)(?:={3,}|\d️⃣)', report, re.DOTALL | re.IGNORECASE)
-    if transition_match:
-        year_items = re.findall(r'(202\d)[:\s-]+(.+?)(?=\n202|\n\n|$)', transition_match.group(1), re.DOTALL)
+    transition_body = _section(bodies, "transition_schedule")
+    if transition_body is not None:
+        year_items = _RE_YEAR_ITEM.findall(transition_body)
         for year, details in year_items[:8]:
-            sections["transition_schedule"].append({"year": year, "details": details.strip()[:200]})
+            parsed.transition_schedule.append({"year": year, "details": details.strip()[:200]})
     
-    return sections
+    return parsed
 
 
-def save_report(report: str, prefix: str = "analysis") -> str:
-    """Save report to file"""
+async def save_report(report: str, prefix: str = "analysis") -> str:
+    """Save report to file (disk write runs off the event loop)"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filepath = f"{OUTPUT_DIR}/{prefix}_{timestamp}.txt"
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(report)
+        await asyncio.to_thread(Path(filepath).write_text, report, encoding='utf-8')
+        _PRODUCED_FILES.add(os.path.basename(filepath))
         return filepath
     except Exception as e:
         print(f"Error saving report: {e}")
         return ""
 
 
+# =============================================================================
+# ANALYSIS CACHE
+# Re-submitting the same URL/query reuses the parsed result for a while
+# =============================================================================
+ANALYSIS_CACHE_TTL = 30 * 60  # seconds
+ANALYSIS_CACHE_MAX_ENTRIES = 256
+
+_ANALYSIS_CACHE: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (timestamp, results)
+_ANALYSIS_LOCKS: Dict[str, asyncio.Lock] = {}
+
+
+def _analysis_cache_key(mode: str, target: str) -> str:
+    return hashlib.blake2b(f"{mode}|{target}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _analysis_cache_get(key: str) -> Optional[Dict]:
+    """Evicts expired entries and returns the cached results for key, if any"""
+    now = time.monotonic()
+    while _ANALYSIS_CACHE:
+        oldest_key, (stored_at, _) = next(iter(_ANALYSIS_CACHE.items()))
+        if now - stored_at < ANALYSIS_CACHE_TTL:
+            break
+        del _ANALYSIS_CACHE[oldest_key]
+    
+    entry = _ANALYSIS_CACHE.get(key)
+    if entry is None:
+        return None
+    _ANALYSIS_CACHE.move_to_end(key)
+    return entry[1]
+
+
+def _analysis_cache_put(key: str, results: Dict):
+    _ANALYSIS_CACHE[key] = (time.monotonic(), results)
+    _ANALYSIS_CACHE.move_to_end(key)
+    while len(_ANALYSIS_CACHE) > ANALYSIS_CACHE_MAX_ENTRIES:
+        _ANALYSIS_CACHE.popitem(last=False)
+
+
+async def run_cached_analysis(mode: str, target: str) -> tuple:
+    """
+    Runs the workflow for a URL ("url") or search query ("search") and parses the report.
+    Returns (results, error). Concurrent requests for the same target share one run.
+    """
+    key = _analysis_cache_key(mode, target)
+    cached = _analysis_cache_get(key)
+    if cached is not None:
+        return cached, None
+    
+    lock = _ANALYSIS_LOCKS.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            cached = _analysis_cache_get(key)
+            if cached is not None:
+                return cached, None
+            
+            workflow_cls = await asyncio.to_thread(get_workflow_cls)
+            workflow = workflow_cls()
+            run_kwargs = {"url": target} if mode == "url" else {"query": target}
+            result = await asyncio.to_thread(workflow.run, **run_kwargs)
+            if "error" in result:
+                return None, result["error"]
+            
+            results = parse_analysis_report(result.get("final_analysis", ""))
+            filepath = await save_report(result["final_analysis"], f"{mode}_analysis")
+            if filepath:
+                results.saved_file = filepath
+            
+            _analysis_cache_put(key, results)
+            return results, None
+    finally:
+        if not lock.locked():
+            _ANALYSIS_LOCKS.pop(key, None)
+
+
 # =============================================================================
 # ROUTES
 # =============================================================================
+@app.on_event("startup")
+async def configure_executor():
+    """Caps the default executor used by asyncio.to_thread"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=MAX_WORKER_THREADS, thread_name_prefix="analysis")
+    )
+
+
+@app.on_event("startup")
+async def index_output_files():
+    """Registers reports saved by previous runs so they stay downloadable"""
+    with os.scandir(OUTPUT_DIR) as entries:
+        _PRODUCED_FILES.update(entry.name for entry in entries if entry.is_file())
+
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request, lang: str = "en"):
     """Main page"""
-    t = get_translations(lang)
     is_valid = False
     if HAS_WORKFLOW:
         is_valid, _ = validate_config()
     
-    return templates.TemplateResponse("index.html", {
+    return templates.TemplateResponse("index.html", base_context(lang) | {
         "request": request,
-        "t": t,
-        "lang": lang,
-        "workflow_available": HAS_WORKFLOW,
-        "monitor_available": HAS_BRAZIL_MONITOR,
         "config_valid": is_valid,
         "results": None,
         "error": None
@@ -323,10 +635,12 @@ async def analyze(
     mode: str = Form(...),
     url: str = Form(None),
     query: str = Form(None),
-    lang: str = Form("en")
+    lang: str = Form("en"),
+    session_id: str = Form(None)
 ):
-    """Process analysis request"""
-    t = get_translations(lang)
+    """Process analysis request (logs stream to /api/logs/{session_id} when given)"""
+    ctx = base_context(lang)
+    t = ctx["t"]
     error = None
     results = None
     
@@ -338,45 +652,29 @@ async def analyze(
             error = f"{t['config_error']}: {', '.join(missing)}"
     
     if not error:
+        log_handler = attach_log_stream(session_id) if session_id else None
         try:
-            workflow = LegislacaoWorkflow()
-            
             if mode == "url" and url:
                 if not url.startswith('http'):
                     error = "Invalid URL"
                 else:
-                    result = workflow.run(url=url)
-                    if "error" in result:
-                        error = result["error"]
-                    else:
-                        results = parse_analysis_report(result.get("final_analysis", ""))
-                        filepath = save_report(result["final_analysis"], "url_analysis")
-                        if filepath:
-                            results["saved_file"] = filepath
+                    results, error = await run_cached_analysis("url", url)
             
             elif mode == "search" and query:
-                result = workflow.run(query=query)
-                if "error" in result:
-                    error = result["error"]
-                else:
-                    results = parse_analysis_report(result.get("final_analysis", ""))
-                    filepath = save_report(result["final_analysis"], "search_analysis")
-                    if filepath:
-                        results["saved_file"] = filepath
+                results, error = await run_cached_analysis("search", query)
             else:
                 error = "Invalid request"
                 
         except Exception as e:
             error = str(e)
+        finally:
+            if log_handler:
+                detach_log_stream(log_handler)
     
-    return templates.TemplateResponse("index.html", {
+    return templates.TemplateResponse("index.html", ctx | {
         "request": request,
-        "t": t,
-        "lang": lang,
-        "workflow_available": HAS_WORKFLOW,
-        "monitor_available": HAS_BRAZIL_MONITOR,
         "config_valid": HAS_WORKFLOW,
-        "results": results,
+        "results": results.as_dict() if results else None,
         "error": error,
         "submitted_url": url,
         "submitted_query": query,
@@ -387,7 +685,6 @@ async def analyze(
 @app.post("/monitor", response_class=HTMLResponse)
 async def monitor(request: Request, lang: str = Form("en")):
     """Run automatic monitoring"""
-    t = get_translations(lang)
     error = None
     results = None
     
@@ -395,10 +692,13 @@ async def monitor(request: Request, lang: str = Form("en")):
         error = "Brazil Monitor not available"
     else:
         try:
-            mon = BrazilMonitor()
-            result = mon.run(output_dir=OUTPUT_DIR)
+            monitor_cls = await asyncio.to_thread(get_monitor_cls)
+            mon = monitor_cls()
+            result = await asyncio.to_thread(mon.run, output_dir=OUTPUT_DIR)
             
             if result and "error" not in result:
+                if result.get("saved_file"):
+                    _PRODUCED_FILES.add(os.path.basename(result["saved_file"]))
                 results = {
                     "monitor_results": result,
                     "articles_found": result.get("articles_found", 0),
@@ -410,12 +710,8 @@ async def monitor(request: Request, lang: str = Form("en")):
         except Exception as e:
             error = str(e)
     
-    return templates.TemplateResponse("index.html", {
+    return templates.TemplateResponse("index.html", base_context(lang) | {
         "request": request,
-        "t": t,
-        "lang": lang,
-        "workflow_available": HAS_WORKFLOW,
-        "monitor_available": HAS_BRAZIL_MONITOR,
         "config_valid": HAS_WORKFLOW,
         "results": results,
         "error": error,
@@ -426,28 +722,38 @@ async def monitor(request: Request, lang: str = Form("en")):
 @app.get("/download/{filename}")
 async def download_file(filename: str):
     """Download report file"""
+    if filename not in _PRODUCED_FILES:
+        raise HTTPException(status_code=404, detail="File not found")
     filepath = os.path.join(OUTPUT_DIR, filename)
-    if not os.path.abspath(filepath).startswith(os.path.abspath(OUTPUT_DIR)):
-        raise HTTPException(status_code=403, detail="Access denied")
-    if not os.path.exists(filepath):
+    try:
+        stat_result = os.stat(filepath)
+    except FileNotFoundError:
+        _PRODUCED_FILES.discard(filename)
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(path=filepath, filename=filename, media_type="text/plain")
+    # Passing the stat avoids a second stat inside FileResponse
+    return FileResponse(path=filepath, filename=filename, media_type="text/plain", stat_result=stat_result)
+
+
+@app.get("/api/logs/{session_id}")
+async def stream_logs(session_id: str):
+    """Server-Sent Events stream of workflow logs for an analysis session"""
+    return StreamingResponse(log_event_stream(session_id), media_type="text/event-stream")
 
 
 @app.get("/api/status")
 async def api_status():
     """API status endpoint"""
     is_valid, missing = validate_config() if HAS_WORKFLOW else (False, [])
-    return JSONResponse({
+    return {
         "status": "ok" if is_valid else "degraded",
         "workflow_available": HAS_WORKFLOW,
         "monitor_available": HAS_BRAZIL_MONITOR,
         "config_valid": is_valid,
         "version": "5.3"
-    })
+    }
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
 
@@ -4,16 +4,31 @@ Dell Brazil Tax Legislation Monitor
 Automatically monitors Brazilian legislation sites and generates Dell-relevant reports
 """
 
-import requests
+import asyncio
+import atexit
+import hashlib
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import sys
+import threading
 import urllib3
 import warnings
 from bs4 import BeautifulSoup
+import soupsieve
 from datetime import datetime
 import re
+import sqlite3
 import time
-from typing import List, Dict
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import tee
+from typing import Dict, Iterable, Iterator, List, Union
+from urllib.parse import urljoin, urlsplit
 import httpx
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI
 import os
 from dotenv import load_dotenv
 
@@ -24,6 +39,30 @@ load_dotenv()
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.filterwarnings('ignore')
 
+# Progress messages go through the "brazil_monitor" logger. Coroutines only enqueue
+# records (QueueHandler); formatting and the stdout write happen on the listener
+# thread, so concurrent fetches/analyses never wait on the stdout lock.
+# Nothing starts on import: run()/main() call _start_console_logging(), and a host
+# that already configured handlers on this logger (e.g. app.py) keeps its own setup.
+logger = logging.getLogger("brazil_monitor")
+_log_setup_lock = threading.Lock()
+
+
+def _start_console_logging():
+    """Starts the stdout queue listener once per process (no-op if handlers exist)"""
+    with _log_setup_lock:
+        if logger.handlers:
+            return
+        log_queue = queue.SimpleQueue()
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        listener = logging.handlers.QueueListener(log_queue, console_handler)
+        listener.start()
+        atexit.register(listener.stop)  # drain pending messages on exit
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
 # =============================================================================
 # API CONFIGURATION
 # Loaded from environment variables or .env file
@@ -31,6 +70,15 @@ warnings.filterwarnings('ignore')
 DEV_GENAI_API_URL = os.getenv("DEV_GENAI_API_URL", "https://genai-api-dev.dell.com/v1")
 DEV_GENAI_API_KEY = os.getenv("DEV_GENAI_API_KEY")
 MODEL_NAME = os.getenv("MODEL_NAME", "llama-3-3-70b-instruct")
+# Mark the fixed system prompt with cache_control so gateways that support prompt
+# caching reuse it across calls; opt-in since not every gateway accepts the field
+PROMPT_CACHE_CONTROL = os.getenv("PROMPT_CACHE_CONTROL", "false").lower() == "true"
+# Non-interactive runs: submit all uncached analyses as one Batch API job (cheaper,
+# higher throughput) instead of live calls; falls back to live calls if the gateway
+# has no Batch API or the job does not complete
+BATCH_MODE = os.getenv("BATCH_MODE", "false").lower() == "true"
+BATCH_COMPLETION_WINDOW = os.getenv("BATCH_COMPLETION_WINDOW", "24h")
+BATCH_POLL_SECONDS = int(os.getenv("BATCH_POLL_SECONDS", "30"))
 
 # =============================================================================
 # BRAZILIAN SITES CONFIGURATION
@@ -93,6 +141,103 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1'
 }
 
+# HTTP fetch settings (sites and article pages are fetched concurrently)
+FETCH_TIMEOUT = 30
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 50
+KEEPALIVE_EXPIRY = 60.0
+MAX_FETCHES_PER_HOST = 10  # Caps simultaneous requests per host to avoid rate limiting
+MAX_ARTICLE_BYTES = 256 * 1024  # Only the first 5000 chars of text are kept; stop reading after this
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# lxml (C backend, already a requirement) builds the tree much faster than html.parser
+HTML_PARSER = "lxml"
+
+# Article pages are parsed in a small process pool, created on first use and reused
+# by every run (each spawned worker re-imports the app and bs4/lxml once)
+PARSE_WORKERS = min(4, os.cpu_count() or 1)
+
+# LLM analyses in flight at once (stays under the GenAI API rate limit)
+MAX_CONCURRENT_ANALYSES = 5
+
+# Relevance keywords checked against the (lower-cased) AI analysis; each list is
+# compiled into one alternation so the text is scanned once per list
+NON_RELEVANT_KEYWORDS = [
+    "não relevante", "não aplicável", "not relevant",
+    "não se aplica", "sem impacto direto"
+]
+RELEVANT_KEYWORDS = [
+    "relevante", "aplicável", "impacta", "dell",
+    "tecnologia", "manufatura", "icms", "ipi",
+    "pis", "cofins", "benefício fiscal"
+]
+_NON_RELEVANT_RE = re.compile('|'.join(map(re.escape, NON_RELEVANT_KEYWORDS)))
+_RELEVANT_RE = re.compile('|'.join(map(re.escape, RELEVANT_KEYWORDS)))
+
+# Cheap filter before the LLM: an article whose (lower-cased) title + content has
+# none of these terms is marked non-relevant without an API call. Keywords match
+# whole words ("iss" not "isso", "pis" not "piso"); stems match by prefix
+# (importa -> importação/importador). Bare "ii"/"is" are left out because they
+# collide with "inciso II" and English text
+PREFILTER_KEYWORDS = [
+    # Tributos atuais e da reforma (LC 214/2024)
+    "icms", "ipi", "pis", "cofins", "irpj", "csll", "iss", "ibs", "cbs",
+    "imposto de importação", "imposto seletivo", "drawback", "ex-tarifário",
+    "lei de informática", "padis", "ncm",
+    # Atividades da Dell
+    "informática", "hardware", "software",
+    # Localizações da Dell
+    "dell", "hortolândia", "eldorado do sul", "barueri", "santana do parnaíba",
+    "cajamar", "são paulo", "rio de janeiro", "rio grande do sul",
+]
+PREFILTER_STEMS = [
+    # Atividades da Dell (flexões e plurais)
+    "importa", "exporta", "computador", "servidor", "equipamento", "tecnologi",
+    "semicondutor", "eletrônic",
+]
+_PREFILTER_RE = re.compile(
+    r'\b(?:(?:' + '|'.join(map(re.escape, PREFILTER_KEYWORDS)) + r')\b'
+    r'|' + '|'.join(map(re.escape, PREFILTER_STEMS)) + ')'
+)
+PREFILTER_SKIPPED = "Pre-filter: no keywords"
+
+# Article text sent to the LLM: longer texts keep their keyword-bearing sentences
+# (in original order) instead of being cut at a fixed offset
+ANALYSIS_CONTENT_CHARS = 3000
+_SENTENCE_RE = re.compile(r'(?<=[.!?;])\s+')
+
+# Report layout: one template per block instead of ~15 list appends per article
+REPORT_SEP = "=" * 80
+REPORT_HEADER_TMPL = (
+    "{sep}\nBRAZILIAN LEGISLATION MONITORING REPORT\nDell Technologies Brazil\n{sep}\n"
+    "Date: {date}\nTotal relevant articles: {n}\n{sep}\n"
+)
+REPORT_ARTICLE_TMPL = (
+    "\n\n{sep}\nARTICLE {i} OF {n}\n{sep}\n"
+    "\nTitle: {title}\nSource: {source}\nDate: {date}\nURL: {url}\n"
+    "\n{sep}\nDELL ANALYSIS:\n{sep}\n{analysis}\n\n{sep}\n"
+)
+REPORT_FOOTER_TMPL = "\n\n{sep}\nEND OF REPORT\n{sep}"
+# The report is streamed to its file; the terminal only shows this many lines
+REPORT_PREVIEW_LINES = 50
+REPORT_WRITE_BUFFER = 1 << 20
+
+# Persistent page cache (listing + article pages) shared across runs
+HTTP_CACHE_PATH = os.getenv("BRAZIL_MONITOR_CACHE", "brazil_monitor_cache.sqlite")
+HTTP_CACHE_TTL = 6 * 3600  # seconds before a cached article page is revalidated (ETag/Last-Modified)
+# Listing pages are always revalidated (conditional GET): new legislation shows up there
+
+# Patterns used per article, compiled once
+_DATE_CLASS_RE = re.compile(r'date|data|publicado')
+_WS_RE = re.compile(r'\s+')
+# (locator, strptime format) pairs: the regex finds the date inside free text,
+# strptime validates it and lets every source be normalized to YYYY-MM-DD
+_DATE_RES = (
+    (re.compile(r'\d{2}/\d{2}/\d{4}'), '%d/%m/%Y'),
+    (re.compile(r'\d{2}-\d{2}-\d{4}'), '%d-%m-%Y'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}'), '%Y-%m-%d'),
+)
+
 # =============================================================================
 # AI SYSTEM PROMPT
 # Defines the AI's role and analysis framework for Dell Brazil
@@ -115,6 +260,176 @@ Framework de Análise:
 
 IMPORTANTE: Forneça análise completa e detalhada."""
 
+# Built once: identical on every call, so it is the cacheable prompt prefix
+if PROMPT_CACHE_CONTROL:
+    _SYSTEM_MESSAGE = {"role": "system", "content": [
+        {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+    ]}
+else:
+    _SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+
+def _trim_content(text: str, limit: int = ANALYSIS_CONTENT_CHARS) -> str:
+    """
+    Trim text to `limit` chars at sentence boundaries, preferring sentences with
+    the most PREFILTER_KEYWORDS hits (ties: earlier first); original order is kept
+    """
+    if len(text) <= limit:
+        return text
+    
+    sentences = _SENTENCE_RE.split(text)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (-len(_PREFILTER_RE.findall(sentences[i].lower())), i)
+    )
+    
+    keep = []
+    size = 0
+    for i in ranked:
+        length = len(sentences[i]) + 1
+        if size + length <= limit:
+            keep.append(i)
+            size += length
+    
+    if not keep:  # one huge "sentence" (no punctuation): plain cut
+        return text[:limit]
+    return ' '.join(sentences[i] for i in sorted(keep))
+
+
+# =============================================================================
+# ARTICLE TEXT EXTRACTION
+# Module-level and stateless so it can run in worker processes (ProcessPoolExecutor)
+# =============================================================================
+CONTENT_SELECTORS = [
+    'article', '.article-content', '.content', '.post-content',
+    '.entry-content', 'main', '.main-content', '.texto-noticia'
+]
+# One combined selector finds every candidate in a single tree walk; the compiled
+# per-selector patterns then pick the candidate by CONTENT_SELECTORS priority
+_CONTENT_SELECTOR = soupsieve.compile(', '.join(CONTENT_SELECTORS))
+_CONTENT_PATTERNS = [soupsieve.compile(selector) for selector in CONTENT_SELECTORS]
+
+
+# <script>/<style> blocks are dropped from the raw bytes before parsing, so the
+# parser never builds nodes for them (often most of a page's bytes)
+_SCRIPT_STYLE_RE = re.compile(rb'<(script|style)\b.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+_DROP_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']
+
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Shared parse pool, started on the first scrape and shut down at exit"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # "spawn" avoids forking a process that may already run other threads (web app)
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                              mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_parse_pool.shutdown)
+        return _parse_pool
+
+
+def _extract_main_text(html: bytes) -> str:
+    """
+    Parse an article page and return its cleaned main text (max 5000 chars)
+    """
+    soup = BeautifulSoup(_SCRIPT_STYLE_RE.sub(b'', html), HTML_PARSER)
+    
+    # Remove unwanted elements (navigation, leftovers); one find_all pass for all tags
+    for element in soup(_DROP_TAGS):
+        element.decompose()
+    
+    # Try to find main content area
+    main_content = None
+    candidates = _CONTENT_SELECTOR.select(soup)
+    for pattern in _CONTENT_PATTERNS:
+        main_content = next((el for el in candidates if pattern.match(el)), None)
+        if main_content:
+            break
+    
+    if not main_content:
+        main_content = soup.find('body')
+    
+    if main_content:
+        # Extract and clean text
+        text = main_content.get_text(separator=' ', strip=True)
+        text = _WS_RE.sub(' ', text)
+        return text[:5000]
+    
+    return ""
+
+
+# =============================================================================
+# HTTP PAGE CACHE
+# Unchanged pages are served from disk instead of being downloaded again
+# =============================================================================
+class HttpCache:
+    """SQLite-backed page cache keyed by URL, storing ETag/Last-Modified for revalidation"""
+    
+    def __init__(self, path: str = HTTP_CACHE_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, fetched_at REAL)"
+        )
+    
+    def get(self, url: str):
+        """Returns (etag, last_modified, body, fetched_at) or None"""
+        return self.conn.execute(
+            "SELECT etag, last_modified, body, fetched_at FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+    
+    def put(self, url: str, etag: str, last_modified: str, body: bytes):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, body, time.time())
+        )
+    
+    def touch(self, url: str):
+        """Marks a page as fresh again after a 304 Not Modified"""
+        self.conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+    
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class AnalysisCache:
+    """
+    SQLite cache of LLM relevance analyses keyed by SHA-256 of model + title + analyzed content
+    (the exact _trim_content text sent in the prompt), so legislation re-published across
+    runs/sites is not sent to the LLM again
+    """
+    
+    def __init__(self, path: str = HTTP_CACHE_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses (content_hash TEXT PRIMARY KEY, analysis TEXT, ts REAL)"
+        )
+    
+    @staticmethod
+    def key(article: Dict) -> str:
+        text = f"{MODEL_NAME}|{article['title']}|{_trim_content(article['content'])}"
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get(self, content_hash: str):
+        row = self.conn.execute(
+            "SELECT analysis FROM analyses WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, content_hash: str, analysis: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?)", (content_hash, analysis, time.time())
+        )
+    
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
 
 # =============================================================================
 # BRAZIL MONITOR CLASS
@@ -133,71 +448,148 @@ class BrazilMonitor:
     """
     
     def __init__(self):
-        """Initialize HTTP session and AI client"""
-        # Setup HTTP session with headers and SSL disabled
-        self.session = requests.Session()
-        self.session.headers.update(HEADERS)
-        self.session.verify = False
-        
-        # Initialize OpenAI-compatible client for Dell GenAI API
-        self.client = OpenAI(
-            base_url=DEV_GENAI_API_URL,
-            api_key=DEV_GENAI_API_KEY,
-            http_client=httpx.Client(verify=False)
-        )
-        
-        print("✅ Brazil Monitor initialized")
-        print(f"📍 Monitoring {len(BRAZILIAN_SITES)} Brazilian sites")
+        """Initialize monitor (HTTP and AI clients are created per run, inside its event loop)"""
+        logger.info("✅ Brazil Monitor initialized")
+        logger.info(f"📍 Monitoring {len(BRAZILIAN_SITES)} Brazilian sites")
     
     # =========================================================================
     # SCRAPING METHODS
     # Responsible for fetching and parsing HTML from legislation sites
     # =========================================================================
-    def scrape_sites(self) -> List[Dict]:
+    def scrape_sites(self, force_refresh: bool = False) -> List[Dict]:
         """
         Scrape all configured sites and collect articles
+        Sites and article pages are fetched concurrently with httpx.AsyncClient
+        
+        Args:
+            force_refresh: Ignore the page cache and download every page again
         
         Returns:
             List of article dictionaries with title, url, date, content
         """
+        logger.info(f"\n🔍 Starting Brazilian sites monitoring...")
+        logger.info("=" * 70)
+        
+        self._force_refresh = force_refresh
+        self._http_cache = HttpCache()
+        try:
+            all_articles = asyncio.run(self._scrape_sites_async())
+        finally:
+            self._http_cache.close()
+        
+        logger.info(f"\n📊 Total articles collected: {len(all_articles)}")
+        return all_articles
+    
+    async def _scrape_sites_async(self) -> List[Dict]:
+        """
+        Scrape all sites in parallel; each site starts fetching its article pages as soon
+        as its listing is parsed. Articles keep the configured site order.
+        """
         all_articles = []
+        # One semaphore per host (MAX_FETCHES_PER_HOST), shared by listing and article fetches
+        self._host_limits = defaultdict(lambda: asyncio.Semaphore(MAX_FETCHES_PER_HOST))
+        # Article URL -> content task, so pages listed by several sites are fetched once
+        self._content_tasks = {}
         
-        print(f"\n🔍 Starting Brazilian sites monitoring...")
-        print("=" * 70)
+        self._parse_pool = _get_parse_pool()
+        # HTTP/2 multiplexes a site's listing and article requests over one TLS connection
+        async with httpx.AsyncClient(headers=HEADERS, verify=False, timeout=FETCH_TIMEOUT,
+                                     follow_redirects=True, http2=True,
+                                     limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                                         max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                                                         keepalive_expiry=KEEPALIVE_EXPIRY)) as client:
+            site_results = await asyncio.gather(*[
+                self._scrape_site(client, site_name, site_config)
+                for site_name, site_config in BRAZILIAN_SITES.items()
+            ])
         
-        for site_name, site_config in BRAZILIAN_SITES.items():
-            print(f"\n📡 Processing: {site_name}")
-            articles = self._scrape_site(site_name, site_config)
-            
+        for site_name, articles in zip(BRAZILIAN_SITES, site_results):
             if articles:
                 all_articles.extend(articles)
-                print(f"✅ {len(articles)} articles found in {site_name}")
+                logger.info(f"✅ {len(articles)} articles found in {site_name}")
             else:
-                print(f"⚠️ No articles found in {site_name}")
-            
-            time.sleep(2)  # Delay between sites to avoid rate limiting
+                logger.warning(f"⚠️ No articles found in {site_name}")
         
-        print(f"\n📊 Total articles collected: {len(all_articles)}")
         return all_articles
     
-    def _scrape_site(self, site_name: str, site_config: Dict) -> List[Dict]:
+    async def _fetch(self, client: httpx.AsyncClient, url: str, max_bytes: int = None,
+                     revalidate: bool = False) -> bytes:
+        """
+        GET url under its host's concurrency limit, through the page cache:
+        fresh entries skip the network, stale ones are revalidated (304 keeps the body),
+        and a cached body is used if the site errors out.
+        revalidate=True (listing pages) always sends the conditional GET, even when fresh.
+        With max_bytes the body is streamed and reading stops once the cap is reached.
+        """
+        cached = None if self._force_refresh else self._http_cache.get(url)
+        if cached and not revalidate and time.time() - cached[3] < HTTP_CACHE_TTL:
+            return cached[2]
+        
+        headers = {}
+        if cached:
+            if cached[0]:
+                headers['If-None-Match'] = cached[0]
+            if cached[1]:
+                headers['If-Modified-Since'] = cached[1]
+        
+        try:
+            async with self._host_limits[urlsplit(url).netloc]:
+                async with client.stream("GET", url, headers=headers) as response:
+                    if cached and response.status_code == 304:
+                        self._http_cache.touch(url)
+                        return cached[2]
+                    response.raise_for_status()
+                    body = await self._read_body(response, max_bytes)
+        except httpx.HTTPError:
+            if cached:
+                return cached[2]
+            raise
+        
+        self._http_cache.put(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body)
+        return body
+    
+    @staticmethod
+    async def _read_body(response: httpx.Response, max_bytes: int = None) -> bytes:
+        """Reads the (decompressed) body, stopping after max_bytes when given"""
+        if max_bytes is None:
+            return await response.aread()
+        
+        chunks = []
+        size = 0
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        return b"".join(chunks)
+    
+    def _article_content(self, client: httpx.AsyncClient, url: str) -> asyncio.Task:
+        """Content task for an article URL, shared by every site that lists it"""
+        task = self._content_tasks.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._get_full_article_content(client, url))
+            self._content_tasks[url] = task
+        return task
+    
+    async def _scrape_site(self, client: httpx.AsyncClient, site_name: str, site_config: Dict) -> List[Dict]:
         """
         Scrape a single site based on its configuration
         
         Args:
+            client: Shared async HTTP client
             site_name: Name identifier for the site
             site_config: Dictionary with URL and CSS selectors
         
         Returns:
-            List of articles from this site
+            List of articles from this site with full content
         """
         articles = []
+        logger.info(f"\n📡 Processing: {site_name}")
         
         try:
-            response = self.session.get(site_config['url'], timeout=30)
-            response.raise_for_status()
+            content = await self._fetch(client, site_config['url'], revalidate=True)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(content, HTML_PARSER)
             
             # Use site-specific extraction method
             if 'legisweb' in site_name.lower():
@@ -206,7 +598,15 @@ class BrazilMonitor:
                 articles = self._extract_generic_articles(soup, site_config)
             
         except Exception as e:
-            print(f"❌ Error processing {site_name}: {str(e)}")
+            logger.error(f"❌ Error processing {site_name}: {str(e)}")
+            return articles
+        
+        # Get full article content by fetching each article page
+        contents = await asyncio.gather(*[
+            self._article_content(client, article['url']) for article in articles
+        ])
+        for article, content in zip(articles, contents):
+            article['content'] = content
         
         return articles
     
@@ -217,11 +617,12 @@ class BrazilMonitor:
         """
         articles = []
         base_url = site_config['base_url']
+        parent_dates: Dict[int, str] = {}  # listing rows share a parent: search it once
         
-        # Find article elements using configured selectors
-        title_elements = soup.select(site_config['selectors']['articles'])
+        # Find article elements using configured selectors (limit stops the walk at 20)
+        title_elements = soup.select(site_config['selectors']['articles'], limit=20)
         
-        for element in title_elements[:20]:  # Limit to 20 articles per site
+        for element in title_elements:  # Limit to 20 articles per site
             try:
                 # Extract link element
                 link_elem = element.find('a')
@@ -233,12 +634,7 @@ class BrazilMonitor:
                     continue
                 
                 # Build absolute URL
-                if href.startswith('http'):
-                    url = href
-                elif href.startswith('/'):
-                    url = base_url + href
-                else:
-                    url = base_url + '/' + href
+                url = urljoin(base_url, href)
                 
                 # Extract title text
                 title = link_elem.get_text(strip=True)
@@ -247,29 +643,27 @@ class BrazilMonitor:
                 
                 # Extract date from parent element
                 date_text = ""
-                parent = element.find_parent()
-                if parent:
-                    date_elem = parent.find(['time', 'span'], class_=re.compile(r'date|data|publicado'))
-                    if date_elem:
-                        date_text = date_elem.get_text(strip=True)
-                
-                # Get full article content by fetching the article page
-                full_content = self._get_full_article_content(url)
+                parent = element.parent
+                if parent is not None:
+                    date_text = parent_dates.get(id(parent))
+                    if date_text is None:
+                        date_elem = parent.find(['time', 'span'], class_=_DATE_CLASS_RE)
+                        date_text = date_elem.get_text(strip=True) if date_elem else ""
+                        parent_dates[id(parent)] = date_text
                 
                 article = {
                     'title': title,
                     'url': url,
                     'date': self._parse_brazilian_date(date_text),
-                    'content': full_content,
+                    'content': '',
                     'source': 'LegiswWeb',
                     'dell_analysis': ''
                 }
                 
                 articles.append(article)
-                time.sleep(1)  # Delay between article fetches
                 
             except Exception as e:
-                print(f"⚠️ Error extracting article: {str(e)}")
+                logger.warning(f"⚠️ Error extracting article: {str(e)}")
                 continue
         
         return articles
@@ -284,9 +678,9 @@ class BrazilMonitor:
         selectors = site_config['selectors']
         
         # Find article elements
-        article_elements = soup.select(selectors['articles'])
+        article_elements = soup.select(selectors['articles'], limit=20)
         
-        for element in article_elements[:20]:
+        for element in article_elements:
             try:
                 # Extract title and link
                 title_elem = element.select_one(selectors['title'])
@@ -300,12 +694,7 @@ class BrazilMonitor:
                     continue
                 
                 # Build absolute URL
-                if href.startswith('http'):
-                    url = href
-                elif href.startswith('/'):
-                    url = base_url + href
-                else:
-                    url = base_url + '/' + href
+                url = urljoin(base_url, href)
                 
                 # Extract date
                 date_text = ""
@@ -313,70 +702,43 @@ class BrazilMonitor:
                 if date_elem:
                     date_text = date_elem.get_text(strip=True)
                 
-                # Get full content
-                full_content = self._get_full_article_content(url)
-                
                 article = {
                     'title': title,
                     'url': url,
                     'date': self._parse_brazilian_date(date_text),
-                    'content': full_content,
+                    'content': '',
                     'source': 'Receita Federal',
                     'dell_analysis': ''
                 }
                 
                 articles.append(article)
-                time.sleep(1)
                 
             except Exception as e:
-                print(f"⚠️ Error extracting article: {str(e)}")
+                logger.warning(f"⚠️ Error extracting article: {str(e)}")
                 continue
         
         return articles
     
-    def _get_full_article_content(self, url: str) -> str:
+    async def _get_full_article_content(self, client: httpx.AsyncClient, url: str) -> str:
         """
         Fetch and extract full text content from an article page
         
         Args:
+            client: Shared async HTTP client
             url: Article URL to fetch
         
         Returns:
             Cleaned text content (max 5000 chars)
         """
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements (scripts, styles, navigation)
-            for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']):
-                element.decompose()
-            
-            # Try to find main content area
-            main_content = None
-            content_selectors = [
-                'article', '.article-content', '.content', '.post-content',
-                '.entry-content', 'main', '.main-content', '.texto-noticia'
-            ]
+            content = await self._fetch(client, url, max_bytes=MAX_ARTICLE_BYTES)
             
-            for selector in content_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            if not main_content:
-                main_content = soup.find('body')
-            
-            if main_content:
-                # Extract and clean text
-                text = main_content.get_text(separator=' ', strip=True)
-                text = re.sub(r'\s+', ' ', text)
-                return text[:5000]
+            # Parsing is CPU-bound: spread it across cores
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._parse_pool, _extract_main_text, content)
             
         except Exception as e:
-            print(f"⚠️ Error fetching content from {url}: {str(e)}")
+            logger.warning(f"⚠️ Error fetching content from {url}: {str(e)}")
         
         return ""
     
@@ -385,24 +747,50 @@ class BrazilMonitor:
         Parse Brazilian date formats (DD/MM/YYYY, DD-MM-YYYY, YYYY-MM-DD)
         
         Returns:
-            Parsed date string or current date if parsing fails
+            Date normalized to YYYY-MM-DD, or current date if parsing fails
         """
         if not date_text:
             return datetime.now().strftime('%Y-%m-%d')
         
-        date_patterns = [
-            r'(\d{2})/(\d{2})/(\d{4})',
-            r'(\d{2})-(\d{2})-(\d{4})',
-            r'(\d{4})-(\d{2})-(\d{2})'
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, date_text)
+        for pattern, fmt in _DATE_RES:
+            match = pattern.search(date_text)
             if match:
-                return match.group(0)
+                try:
+                    return datetime.strptime(match.group(0), fmt).strftime('%Y-%m-%d')
+                except ValueError:
+                    continue  # e.g. 31/02/2024: try the next format
         
         return datetime.now().strftime('%Y-%m-%d')
     
+    @staticmethod
+    def _dedupe_articles(articles: List[Dict]) -> List[Dict]:
+        """
+        Drop articles already seen by URL or by identical content (first 2000 chars)
+        Overlapping listings and feeds re-surface the same legislation
+        """
+        seen_urls = set()
+        content_hashes = set()
+        unique = []
+        
+        for article in articles:
+            if article['url'] in seen_urls:
+                continue
+            seen_urls.add(article['url'])
+            
+            content = article['content'][:2000]
+            if content:  # failed fetches ('') must not collide with each other
+                digest = hashlib.blake2b(content.encode(), digest_size=16).digest()
+                if digest in content_hashes:
+                    continue
+                content_hashes.add(digest)
+            
+            unique.append(article)
+        
+        if len(unique) < len(articles):
+            logger.info(f"🔁 Skipped {len(articles) - len(unique)} duplicate articles")
+        
+        return unique
+    
     # =========================================================================
     # AI ANALYSIS METHODS
     # Uses LLM to analyze articles for Dell relevance
@@ -417,48 +805,92 @@ class BrazilMonitor:
         Returns:
             List of articles that are relevant to Dell
         """
-        print(f"\n🤖 Starting Dell relevance analysis with AI...")
-        print("=" * 70)
+        logger.info(f"\n🤖 Starting Dell relevance analysis with AI...")
+        logger.info("=" * 70)
         
-        analyzed_articles = []
+        analyzed_articles = asyncio.run(self._analyze_articles_async(articles))
         
-        for i, article in enumerate(articles, 1):
-            print(f"\n[{i}/{len(articles)}] Analyzing: {article['title'][:60]}...")
+        logger.info(f"\n📊 Analysis complete:")
+        logger.info(f"  • Total analyzed: {len(articles)}")
+        logger.info(f"  • Dell relevant: {len(analyzed_articles)}")
+        logger.info(f"  • Relevance rate: {(len(analyzed_articles)/len(articles)*100):.1f}%")
+        
+        return analyzed_articles
+    
+    async def _analyze_articles_async(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Run up to MAX_CONCURRENT_ANALYSES LLM calls at once; relevant articles keep input order
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+        cache = AnalysisCache()
+        
+        async with httpx.AsyncClient(
+            verify=False,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        ) as http_client:
+            # OpenAI-compatible client for Dell GenAI API
+            client = AsyncOpenAI(base_url=DEV_GENAI_API_URL, api_key=DEV_GENAI_API_KEY, http_client=http_client)
             
-            try:
-                # Perform AI analysis
-                analysis = self._perform_dell_analysis(article)
-                article['dell_analysis'] = analysis
+            # Batch mode: resolve every analysis that would hit the API in one job up front;
+            # anything missing from the batch output goes through the live path below
+            batch_results = {}
+            if BATCH_MODE:
+                pending = [
+                    (i, article) for i, article in enumerate(articles, 1)
+                    if _PREFILTER_RE.search(f"{article['title']} {article['content']}".lower())
+                    and cache.get(AnalysisCache.key(article)) is None
+                ]
+                if pending:
+                    try:
+                        batch_results = await self._perform_batch_analysis(client, pending)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Batch analysis unavailable ({str(e)}), using live calls")
+            
+            async def analyze(i: int, article: Dict) -> bool:
+                if not _PREFILTER_RE.search(f"{article['title']} {article['content']}".lower()):
+                    logger.info(f"\n[{i}/{len(articles)}] ⏭️ Pre-filtered (no keywords): {article['title'][:60]}...")
+                    article['dell_analysis'] = PREFILTER_SKIPPED
+                    return False
                 
-                # Check if relevant
-                if self._is_dell_relevant(analysis):
-                    analyzed_articles.append(article)
-                    print("✅ Relevant to Dell")
+                content_hash = AnalysisCache.key(article)
+                cached = cache.get(content_hash)
+                if cached is not None:
+                    logger.info(f"\n[{i}/{len(articles)}] ♻️ Cached analysis: {article['title'][:60]}...")
+                    article['dell_analysis'] = cached
+                elif i in batch_results:
+                    logger.info(f"\n[{i}/{len(articles)}] 📦 Batch analysis: {article['title'][:60]}...")
+                    article['dell_analysis'] = batch_results[i]
+                    cache.put(content_hash, article['dell_analysis'])
                 else:
-                    print("❌ Not relevant to Dell")
-                
-                time.sleep(2)  # Rate limiting for API
+                    async with semaphore:
+                        logger.info(f"\n[{i}/{len(articles)}] Analyzing: {article['title'][:60]}...")
+                        try:
+                            article['dell_analysis'] = await self._perform_dell_analysis(client, article)
+                        except Exception as e:
+                            logger.warning(f"⚠️ Analysis error: {str(e)}")
+                            return False
+                    if article['dell_analysis'] != "Analysis error":
+                        cache.put(content_hash, article['dell_analysis'])
                 
-            except Exception as e:
-                print(f"⚠️ Analysis error: {str(e)}")
-                continue
-        
-        print(f"\n📊 Analysis complete:")
-        print(f"  • Total analyzed: {len(articles)}")
-        print(f"  • Dell relevant: {len(analyzed_articles)}")
-        print(f"  • Relevance rate: {(len(analyzed_articles)/len(articles)*100):.1f}%")
+                # Check if relevant
+                if self._is_dell_relevant(article['dell_analysis']):
+                    logger.info(f"✅ [{i}] Relevant to Dell")
+                    return True
+                logger.info(f"❌ [{i}] Not relevant to Dell")
+                return False
+            
+            try:
+                relevant = await asyncio.gather(*[analyze(i, article) for i, article in enumerate(articles, 1)])
+            finally:
+                cache.close()
         
-        return analyzed_articles
+        return [article for article, is_relevant in zip(articles, relevant) if is_relevant]
     
-    def _perform_dell_analysis(self, article: Dict) -> str:
+    @staticmethod
+    def _analysis_request(article: Dict) -> Dict:
         """
-        Send article to AI for Dell relevance analysis
-        
-        Args:
-            article: Article dictionary with title, content, etc.
-        
-        Returns:
-            AI-generated analysis text
+        Build the chat.completions request body for one article
+        (shared by live calls and Batch API JSONL lines)
         """
         content = f"""
 Título: {article['title']}
@@ -467,24 +899,86 @@ Fonte: {article['source']}
 URL: {article['url']}
 
 Conteúdo:
-{article['content'][:3000]}
+{_trim_content(article['content'])}
 """
+        return {
+            "model": MODEL_NAME,
+            "messages": [
+                _SYSTEM_MESSAGE,
+                {"role": "user", "content": f"Analise a seguinte legislação brasileira e determine sua relevância para Dell Technologies Brasil:\n\n{content}"}
+            ],
+            "max_tokens": 2000,
+            "temperature": 0.3,
+        }
+    
+    async def _perform_batch_analysis(self, client: AsyncOpenAI, pending: List[tuple]) -> Dict[int, str]:
+        """
+        Submit analyses as one Batch API job and wait for it to finish
+        
+        Args:
+            client: Async OpenAI-compatible client
+            pending: (index, article) pairs to analyze
+        
+        Returns:
+            Analysis text by article index (only requests that succeeded)
+        """
+        lines = b"".join(
+            orjson.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._analysis_request(article),
+            }) + b"\n"
+            for i, article in pending
+        )
         
+        batch_file = await client.files.create(file=("dell_analyses.jsonl", lines), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        logger.info(f"\n📦 Submitted batch {batch.id} with {len(pending)} analyses")
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"batch {batch.id} ended with status {batch.status}")
+        
+        output = await client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                message = response["body"]["choices"][0]["message"]["content"]
+                results[int(record["custom_id"])] = message.strip()
+        
+        logger.info(f"📦 Batch {batch.id}: {len(results)}/{len(pending)} analyses returned")
+        return results
+    
+    async def _perform_dell_analysis(self, client: AsyncOpenAI, article: Dict) -> str:
+        """
+        Send article to AI for Dell relevance analysis
+        
+        Args:
+            client: Async OpenAI-compatible client
+            article: Article dictionary with title, content, etc.
+        
+        Returns:
+            AI-generated analysis text
+        """
         try:
-            response = self.client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": f"Analise a seguinte legislação brasileira e determine sua relevância para Dell Technologies Brasil:\n\n{content}"}
-                ],
-                max_tokens=2000,
-                temperature=0.3
-            )
+            response = await client.chat.completions.create(**self._analysis_request(article))
             
             return response.choices[0].message.content.strip()
             
         except Exception as e:
-            print(f"❌ AI analysis error: {str(e)}")
+            logger.error(f"❌ AI analysis error: {str(e)}")
             return "Analysis error"
     
     def _is_dell_relevant(self, analysis: str) -> bool:
@@ -502,81 +996,57 @@ Conteúdo:
         
         analysis_lower = analysis.lower()
         
-        # Non-relevance indicators
-        non_relevant = [
-            "não relevante", "não aplicável", "not relevant",
-            "não se aplica", "sem impacto direto"
-        ]
-        
-        for indicator in non_relevant:
-            if indicator in analysis_lower:
-                return False
-        
-        # Relevance indicators
-        relevant = [
-            "relevante", "aplicável", "impacta", "dell",
-            "tecnologia", "manufatura", "icms", "ipi",
-            "pis", "cofins", "benefício fiscal"
-        ]
-        
-        for indicator in relevant:
-            if indicator in analysis_lower:
-                return True
+        # Non-relevance indicators win over relevance indicators
+        if _NON_RELEVANT_RE.search(analysis_lower):
+            return False
         
-        return False
+        return bool(_RELEVANT_RE.search(analysis_lower))
     
     # =========================================================================
     # REPORT GENERATION METHODS
     # Creates formatted reports from analysis results
     # =========================================================================
-    def generate_report(self, articles: List[Dict]) -> str:
+    def generate_report(self, articles: List[Dict]) -> Iterator[str]:
         """
         Generate consolidated report from analyzed articles
         
         Args:
             articles: List of relevant article dictionaries
         
-        Returns:
-            Formatted report string
+        Yields:
+            Report blocks (header, one per article, footer); ''.join() gives the full text
         """
-        print(f"\n📄 Generating report...")
-        
-        report_lines = []
-        report_lines.append("=" * 80)
-        report_lines.append("BRAZILIAN LEGISLATION MONITORING REPORT")
-        report_lines.append("Dell Technologies Brazil")
-        report_lines.append("=" * 80)
-        report_lines.append(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
-        report_lines.append(f"Total relevant articles: {len(articles)}")
-        report_lines.append("=" * 80)
-        report_lines.append("")
+        logger.info(f"\n📄 Generating report...")
         
+        n = len(articles)
+        yield REPORT_HEADER_TMPL.format(
+            sep=REPORT_SEP, date=datetime.now().strftime('%d/%m/%Y %H:%M:%S'), n=n
+        )
         for i, article in enumerate(articles, 1):
-            report_lines.append(f"\n{'=' * 80}")
-            report_lines.append(f"ARTICLE {i} OF {len(articles)}")
-            report_lines.append(f"{'=' * 80}")
-            report_lines.append(f"\nTitle: {article['title']}")
-            report_lines.append(f"Source: {article['source']}")
-            report_lines.append(f"Date: {article['date']}")
-            report_lines.append(f"URL: {article['url']}")
-            report_lines.append(f"\n{'=' * 80}")
-            report_lines.append("DELL ANALYSIS:")
-            report_lines.append(f"{'=' * 80}")
-            report_lines.append(article['dell_analysis'])
-            report_lines.append(f"\n{'=' * 80}\n")
-        
-        report_lines.append("\n" + "=" * 80)
-        report_lines.append("END OF REPORT")
-        report_lines.append("=" * 80)
-        
-        return "\n".join(report_lines)
-    
-    def save_report(self, report: str, filename: str = None, output_dir: str = None):
+            yield REPORT_ARTICLE_TMPL.format(
+                sep=REPORT_SEP, i=i, n=n, title=article['title'], source=article['source'],
+                date=article['date'], url=article['url'], analysis=article['dell_analysis']
+            )
+        yield REPORT_FOOTER_TMPL.format(sep=REPORT_SEP)
+    
+    @staticmethod
+    def _report_preview(blocks: Iterable[str], max_lines: int = REPORT_PREVIEW_LINES) -> str:
+        """Return the first max_lines lines of a block stream, reading only as far as needed"""
+        taken = []
+        newlines = 0
+        for block in blocks:
+            taken.append(block)
+            newlines += block.count('\n')
+            if newlines >= max_lines:
+                break
+        return '\n'.join(''.join(taken).split('\n')[:max_lines])
+    
+    def save_report(self, report: Union[str, Iterable[str]], filename: str = None, output_dir: str = None):
         """
         Save report to file
         
         Args:
-            report: Report content
+            report: Report content, or an iterable of report blocks (written as produced)
             filename: Optional filename (auto-generated if not provided)
             output_dir: Optional output directory
         
@@ -594,21 +1064,24 @@ Conteúdo:
             filepath = filename
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(report)
+            with open(filepath, 'w', encoding='utf-8', buffering=REPORT_WRITE_BUFFER) as f:
+                if isinstance(report, str):
+                    f.write(report)
+                else:
+                    f.writelines(report)
             
-            print(f"\n✅ Report saved: {filepath}")
+            logger.info(f"\n✅ Report saved: {filepath}")
             return filepath
             
         except Exception as e:
-            print(f"❌ Error saving report: {str(e)}")
+            logger.error(f"❌ Error saving report: {str(e)}")
             return None
     
     # =========================================================================
     # MAIN EXECUTION METHOD
     # Orchestrates the complete monitoring workflow
     # =========================================================================
-    def run(self, output_dir: str = None):
+    def run(self, output_dir: str = None, force_refresh: bool = False):
         """
         Execute complete monitoring workflow
         
@@ -620,47 +1093,55 @@ Conteúdo:
         
         Args:
             output_dir: Directory to save report
+            force_refresh: Bypass the HTTP page cache for this run
         
         Returns:
             Dictionary with results or None if no relevant articles
         """
-        print("\n" + "=" * 80)
-        print("🚀 DELL BRAZIL TAX LEGISLATION MONITOR")
-        print("=" * 80)
+        _start_console_logging()
+        
+        logger.info("\n" + "=" * 80)
+        logger.info("🚀 DELL BRAZIL TAX LEGISLATION MONITOR")
+        logger.info("=" * 80)
         
         # Step 1: Scrape sites
-        articles = self.scrape_sites()
+        articles = self.scrape_sites(force_refresh=force_refresh)
         
         if not articles:
-            print("\n❌ No articles found. Exiting...")
+            logger.warning("\n❌ No articles found. Exiting...")
             return None
         
+        # Same URL / same text from overlapping feeds: analyze only once
+        articles = self._dedupe_articles(articles)
+        
         # Step 2: AI analysis
         relevant_articles = self.analyze_articles_with_ai(articles)
         
         if not relevant_articles:
-            print("\n⚠️ No Dell-relevant articles found.")
+            logger.info("\n⚠️ No Dell-relevant articles found.")
             return None
         
-        # Step 3: Generate report
-        report = self.generate_report(relevant_articles)
+        # Step 3: Generate report (blocks are produced lazily, never joined in memory)
+        report_blocks, preview_blocks = tee(self.generate_report(relevant_articles))
         
-        # Step 4: Display report
-        print("\n" + "=" * 80)
-        print("📋 GENERATED REPORT:")
-        print("=" * 80)
-        print(report)
+        # Step 4: Display report preview
+        logger.info("\n" + "=" * 80)
+        logger.info("📋 GENERATED REPORT:")
+        logger.info("=" * 80)
+        logger.info(self._report_preview(preview_blocks))
+        del preview_blocks  # stop tee from buffering blocks for the preview
         
-        # Step 5: Save report
-        filename = self.save_report(report, output_dir=output_dir)
+        # Step 5: Save report (streams the remaining blocks straight to the file)
+        filename = self.save_report(report_blocks, output_dir=output_dir)
+        if filename:
+            logger.info(f"📄 Full report: {filename}")
         
-        print("\n" + "=" * 80)
-        print("✅ MONITORING COMPLETE!")
-        print("=" * 80)
+        logger.info("\n" + "=" * 80)
+        logger.info("✅ MONITORING COMPLETE!")
+        logger.info("=" * 80)
         
         return {
             "articles": relevant_articles,
-            "report": report,
             "saved_file": filename
         }
 
@@ -671,9 +1152,11 @@ Conteúdo:
 # =============================================================================
 def main():
     """Main function for standalone execution"""
+    _start_console_logging()
+    
     if not DEV_GENAI_API_KEY:
-        print("❌ ERROR: DEV_GENAI_API_KEY not configured!")
-        print("Configure the environment variable or .env file")
+        logger.error("❌ ERROR: DEV_GENAI_API_KEY not configured!")
+        logger.error("Configure the environment variable or .env file")
         return
     
     try:
@@ -681,11 +1164,10 @@ def main():
         monitor.run()
         
     except KeyboardInterrupt:
-        print("\n\n⚠️ Execution interrupted by user")
+        logger.warning("\n\n⚠️ Execution interrupted by user")
     except Exception as e:
-        print(f"\n❌ Fatal error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        # Traceback goes through the same queue so it stays in order with progress output
+        logger.exception(f"\n❌ Fatal error: {str(e)}")
 
 
 if __name__ == "__main__":
@@ -13,6 +13,8 @@ NOVIDADES v4.8:
 """
 
 import os
+import sys
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -35,6 +37,12 @@ MAX_TOKENS_IMPACT = 2500
 MAX_ENHANCEMENT_ITERATIONS = 2
 MIN_COMPLETENESS_SCORE = 0.80
 
+# Cache exato de respostas do LLM (BaseAgent._call_api): mesmo modelo + temperatura
+# + prompt devolve a resposta salva sem nova chamada. Opcional: desativado se vazio.
+# Respostas mais antigas que LLM_CACHE_TTL_HOURS são ignoradas e removidas.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "24"))
+
 # ============================================================================
 # INFORMAÇÕES DA DELL TECHNOLOGIES BRAZIL
 # ============================================================================
@@ -259,7 +267,7 @@ LEGISLACAO_ESTADUAL_INFO = """
 # 🆕 LISTA COMPLETA DE TRIBUTOS SUPORTADOS
 # ============================================================================
 
-TRIBUTOS_SUPORTADOS = {
+_TRIBUTOS_SUPORTADOS = {
     # Tributos Federais Atuais
     'PIS': {
         'nome_completo': 'Programa de Integração Social',
@@ -365,6 +373,12 @@ TRIBUTOS_SUPORTADOS = {
     },
 }
 
+# Tabela somente leitura; chaves internadas para que testes `tributo in ...`
+# com siglas internadas comparem por identidade
+TRIBUTOS_SUPORTADOS = MappingProxyType({
+    sys.intern(sigla): info for sigla, info in _TRIBUTOS_SUPORTADOS.items()
+})
+
 # ============================================================================
 # PROMPTS GENÉRICOS V4.3 - QUALQUER TIPO DE LEGISLAÇÃO
 # ============================================================================
@@ -657,28 +671,30 @@ DELL_ANALYSIS_TEMPLATE = """
 # TEMPLATES POR TIPO DE LEGISLAÇÃO
 # ============================================================================
 
-TEMPLATES = {
-    "default": DELL_ANALYSIS_TEMPLATE,
-    "lei": DELL_ANALYSIS_TEMPLATE,
-    "lei_complementar": DELL_ANALYSIS_TEMPLATE,
-    "medida_provisoria": DELL_ANALYSIS_TEMPLATE,
-    "decreto": DELL_ANALYSIS_TEMPLATE,
-    "portaria": DELL_ANALYSIS_TEMPLATE,
-    "instrucao_normativa": DELL_ANALYSIS_TEMPLATE,
-    "regime_tributario": DELL_ANALYSIS_TEMPLATE,
-    "convenio_icms": DELL_ANALYSIS_TEMPLATE,
-    "protocolo_icms": DELL_ANALYSIS_TEMPLATE,
-    "ajuste_sinief": DELL_ANALYSIS_TEMPLATE,
-    "reforma_tributaria": DELL_ANALYSIS_TEMPLATE,
-}
+# Hoje todos os tipos (lei, decreto, convenio_icms, reforma_tributaria...) usam
+# DELL_ANALYSIS_TEMPLATE; registre aqui apenas tipos com template próprio
+_SPECIAL_TEMPLATES = {}
 
 def get_template(leg_type: str = "default") -> str:
     """Retorna template apropriado"""
-    return TEMPLATES.get(leg_type, DELL_ANALYSIS_TEMPLATE)
+    return _SPECIAL_TEMPLATES.get(leg_type, DELL_ANALYSIS_TEMPLATE)
 
 def validate_config():
     """Valida configuração"""
     missing = []
     if not DEV_GENAI_API_KEY:
         missing.append("DEV_GENAI_API_KEY")
-    return len(missing) == 0, missing
\ No newline at end of file
+    return len(missing) == 0, missing
+
+# Cercas markdown em volta do JSON devolvido pelo LLM (só no início/fim do texto)
+def strip_md_fence(text: str) -> str:
+    """Remove ```json / ``` do início e ``` do fim sem passar por regex"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text[3:]
+        if text[:4].lower() == 'json':
+            text = text[4:]
+        text = text.lstrip()
+    if text.endswith('```'):
+        text = text[:-3].rstrip()
+    return text
@@ -12,16 +12,19 @@ MUDANÇAS v5.2:
 - Regex apenas como fallback secundário
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from functools import cached_property, lru_cache, partial
+from types import MappingProxyType
 from openai import OpenAI
 import re
-import json
+import orjson
 from datetime import datetime
 from config import (
     DEV_GENAI_API_KEY, 
     DEV_GENAI_API_URL, 
     MODEL_NAME,
-    MAX_TOKENS_EXTRACTION
+    MAX_TOKENS_EXTRACTION,
+    strip_md_fence
 )
 
 # 🆕 v5.2: Importa knowledge base
@@ -32,91 +35,72 @@ try:
         merge_with_extracted_data
     )
     HAS_KNOWLEDGE_BASE = True
+    
+    @lru_cache(maxsize=256)
+    def _detect_known_by_url(url: str) -> Optional[str]:
+        """Detecção só pela URL (sem varrer o conteúdo; o detector ignora o título), memorizada por url"""
+        return detect_known_legislation(url, "")
 except ImportError:
     HAS_KNOWLEDGE_BASE = False
     print("   ⚠️  Knowledge base não disponível, usando apenas extração automática")
 
 
-class DateExtractionAgent:
-    """Agente 5: Extrai vigências via LLM reasoning - VERSÃO v5.2"""
+# Padrões do fallback regex, compilados uma única vez no import:
+# (padrão compilado, template da descrição, tipo de vigência)
+_FALLBACK_PATTERNS = tuple((re.compile(p, re.IGNORECASE), d, t) for p, d, t in [
+    # "vigência a partir de DD/MM/AAAA"
+    (r'vig[êe]ncia\s+a\s+partir\s+de\s+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', 'Início da vigência', 'inicio_vigencia'),
     
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=DEV_GENAI_API_KEY,
-            base_url=DEV_GENAI_API_URL
-        )
-        self.model = MODEL_NAME
-        self.current_year = datetime.now().year
+    # "até DD/MM/AAAA"
+    (r'at[ée]\s+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', 'Prazo até', 'prazo_aquisicao'),
     
-    def extract(self, web_results: List[Dict], raw_extraction: Dict) -> Dict:
-        """Extrai vigências usando LLM reasoning + Knowledge Base fallback"""
-        print("   📅 Extraindo datas e vigências via LLM reasoning...")
-        
-        content = self._consolidate_content(web_results)
-        raw_text = raw_extraction.get("raw_text", "")
-        
-        # 🆕 v5.2: Detecta se é uma lei conhecida ANTES de extrair
-        known_law_key = None
-        if HAS_KNOWLEDGE_BASE and web_results:
-            url = web_results[0].get('url', '')
-            title = web_results[0].get('title', '')
-            known_law_key = detect_known_legislation(url, content, title)
-            
-            if known_law_key:
-                print(f"   📚 Lei conhecida detectada: {known_law_key}")
-        
-        combined_content = f"{content[:8000]}\n\n{raw_text[:4000]}"
-        
-        # 🆕 v5.2: Se é lei conhecida e complexa, usa prompt especializado
-        if known_law_key == "LC_214":
-            vigencias = self._extract_via_llm_reforma(combined_content)
-        else:
-            vigencias = self._extract_via_llm(combined_content)
-        
-        # 🆕 v5.2: Se LLM encontrou pouco E temos knowledge base, usa fallback
-        if HAS_KNOWLEDGE_BASE and known_law_key:
-            if not vigencias or len(vigencias) < 3:
-                print(f"   📚 Usando Knowledge Base como fallback para {known_law_key}...")
-                kb_vigencias = get_vigencias_for_legislation(known_law_key)
-                if kb_vigencias:
-                    vigencias = kb_vigencias
-                    print(f"   ✅ Knowledge Base forneceu {len(vigencias)} vigências")
-        
-        # Fallback secundário: regex (se ainda não temos dados suficientes)
-        if not vigencias or len(vigencias) < 2:
-            print("   ⚠️  Usando fallback regex...")
-            vigencias_regex = self._extract_regex_fallback(combined_content)
-            vigencias.extend(vigencias_regex)
-            # Remove duplicatas
-            seen = set()
-            vigencias = [v for v in vigencias 
-                        if v['data'] not in seen and not seen.add(v['data'])]
-        
-        return {
-            "dates_text": "\n".join([f"{v['data']}: {v['contexto']}" for v in vigencias]),
-            "vigencias": vigencias[:8],  # 🆕 v5.2: Aumentado para 8 (reforma tem muitas datas)
-            "count": len(vigencias[:8]),
-            "known_law_key": known_law_key  # 🆕 v5.2: Passa a chave para outros agentes
-        }
+    # "prazo de X anos"
+    (r'prazo\s+de\s+(\d+)\s+ano', 'Prazo de {} ano(s)', 'duracao_beneficio'),
     
-    def _consolidate_content(self, web_results: List[Dict]) -> str:
-        """Consolida conteúdo das fontes"""
-        parts = []
-        for r in web_results[:2]:
-            if r.get('content'):
-                parts.append(r['content'][:5000])
-        return "\n\n".join(parts)
+    # "mínimo de X anos"
+    (r'm[íi]nimo\s+(?:de\s+)?(\d+)\s+ano', 'Prazo mínimo de {} ano(s)', 'prazo_permanencia'),
     
-    def _extract_via_llm_reforma(self, content: str) -> List[Dict]:
-        """
-        🆕 v5.2 NOVO: Prompt especializado para REFORMA TRIBUTÁRIA (LC 214)
-        """
-        prompt = f"""Você é um especialista em REFORMA TRIBUTÁRIA BRASILEIRA (LC 214/2025).
+    # 🆕 v5.2: Padrões para reforma tributária
+    (r'a\s+partir\s+de\s+(202[5-9]|203[0-3])', 'A partir de {}', 'inicio_vigencia'),
+    (r'em\s+(202[5-9]|203[0-3])', 'Em {}', 'inicio_vigencia'),
+])
+_YEAR_RE = re.compile(r'20\d{2}')
+
+
+# Vigências mínimas na Knowledge Base para dispensar o LLM numa lei conhecida
+# (só com kb_shortcut=True; por padrão o LLM sempre roda e a KB é fallback)
+KB_MIN_VIGENCIAS = 5
+
+# Tipos de vigência aceitos (os mesmos listados em "TIPOS VÁLIDOS" nos prompts)
+_VALID_TIPOS = frozenset({
+    'inicio_vigencia', 'prazo_aquisicao', 'duracao_beneficio', 'prazo_permanencia',
+    'prazo_transicao', 'prazo_final', 'publicacao'
+})
+
+# Tipos de vigência ordenados primeiro (após relevância alta)
+_HIGH_PRIORITY_TIPOS = frozenset({'inicio_vigencia', 'prazo_aquisicao', 'prazo_final'})
+
+# ✅ v5.1: Emoji por tipo de vigência (montado uma vez, consultado por vigência)
+_TIPO_EMOJI = MappingProxyType({
+    'inicio_vigencia': '🟢',      # Verde = início
+    'prazo_aquisicao': '⏰',      # Relógio = prazo
+    'duracao_beneficio': '📆',    # Calendário = duração
+    'prazo_permanencia': '🔒',    # Cadeado = obrigação
+    'prazo_transicao': '🔄',      # 🆕 v5.2: Setas = transição
+    'prazo_final': '🔴',          # Vermelho = fim
+    'publicacao': '📋',           # Documento
+})
+
+
+# Prompts de extração: a parte fixa é montada uma vez no import e só o conteúdo
+# da legislação é concatenado a cada chamada (sem reconstruir ~4 KB por documento)
+_REFORMA_PROMPT_HEAD = """Você é um especialista em REFORMA TRIBUTÁRIA BRASILEIRA (LC 214/2025).
 
 TAREFA: Extraia TODAS as datas e prazos do CRONOGRAMA DE TRANSIÇÃO da reforma tributária.
 
 TEXTO DA LEGISLAÇÃO:
-{content[:12000]}
+"""
+_REFORMA_PROMPT_TAIL = """
 
 ⚠️ ATENÇÃO ESPECIAL - REFORMA TRIBUTÁRIA:
 
@@ -142,40 +126,40 @@ Esta é a LC 214/2025 (Reforma Tributária). Procure ESPECIFICAMENTE por:
    - Prazos para adesão a regimes especiais
 
 FORMATO DE SAÍDA (JSON):
-{{
+{
   "vigencias": [
-    {{
+    {
       "data": "16/01/2025",
       "contexto": "Publicação e início da vigência da LC 214",
       "tipo": "inicio_vigencia",
       "relevancia": "alta"
-    }},
-    {{
+    },
+    {
       "data": "2026",
       "contexto": "Início do período de teste - CBS 0,9% + IBS 0,1%",
       "tipo": "inicio_vigencia",
       "relevancia": "alta"
-    }},
-    {{
+    },
+    {
       "data": "2027",
       "contexto": "CBS entra em vigor com alíquota cheia; IS entra em vigor",
       "tipo": "inicio_vigencia",
       "relevancia": "alta"
-    }},
-    {{
+    },
+    {
       "data": "2029-2032",
       "contexto": "Período de transição - redução gradual de PIS/COFINS/ICMS/ISS",
       "tipo": "prazo_transicao",
       "relevancia": "alta"
-    }},
-    {{
+    },
+    {
       "data": "2033",
       "contexto": "Extinção total de PIS, COFINS, ICMS e ISS",
       "tipo": "prazo_final",
       "relevancia": "alta"
-    }}
+    }
   ]
-}}
+}
 
 TIPOS VÁLIDOS:
 - "inicio_vigencia": quando algo começa
@@ -185,21 +169,15 @@ TIPOS VÁLIDOS:
 
 RESPONDA APENAS COM O JSON, SEM EXPLICAÇÕES."""
 
-        return self._call_llm_and_parse(prompt)
-    
-    def _extract_via_llm(self, content: str) -> List[Dict]:
-        """
-        MÉTODO PRINCIPAL v5.1: Extrai vigências via LLM reasoning
-        COM TIPOS DE VIGÊNCIA MAIS CLAROS
-        """
-        
-        prompt = f"""Você é um especialista em análise de legislação brasileira.
+_EXTRACTION_PROMPT_HEAD = """Você é um especialista em análise de legislação brasileira.
 
 TAREFA: Extraia APENAS as vigências e prazos CRÍTICOS para compliance fiscal.
 ⚠️ IMPORTANTE: Diferencie claramente os TIPOS de prazo!
 
 TEXTO DA LEGISLAÇÃO:
-{content[:10000]}
+"""
+# Formatado uma vez por agente em __init__ (ANO ATUAL)
+_EXTRACTION_PROMPT_TAIL_TMPL = """
 
 INSTRUÇÕES CRÍTICAS:
 1. FOQUE em datas de VIGÊNCIA (quando a lei entra em vigor)
@@ -232,8 +210,8 @@ D) INÍCIO DE VIGÊNCIA:
    - Quando a lei passa a valer
    - TIPO: "inicio_vigencia"
 
-ANO ATUAL: {self.current_year}
-IMPORTANTE: Priorize datas >= {self.current_year}
+ANO ATUAL: {current_year}
+IMPORTANTE: Priorize datas >= {current_year}
 
 FORMATO DE SAÍDA (JSON):
 {{
@@ -281,75 +259,209 @@ RELEVÂNCIA:
 
 RESPONDA APENAS COM O JSON, SEM EXPLICAÇÕES ADICIONAIS."""
 
+
+class DateExtractionAgent:
+    """Agente 5: Extrai vigências via LLM reasoning - VERSÃO v5.2"""
+    
+    def __init__(self):
+        self.model = MODEL_NAME
+        self.current_year = datetime.now().year
+        self._extraction_prompt_tail = _EXTRACTION_PROMPT_TAIL_TMPL.format(current_year=self.current_year)
+    
+    @cached_property
+    def client(self) -> OpenAI:
+        """Cliente OpenAI criado no primeiro uso (leis servidas só pela Knowledge Base não o criam)"""
+        return OpenAI(
+            api_key=DEV_GENAI_API_KEY,
+            base_url=DEV_GENAI_API_URL
+        )
+    
+    @cached_property
+    def _create(self):
+        """chat.completions.create com os parâmetros fixos do agente já aplicados (lazy, como client)"""
+        return partial(
+            self.client.chat.completions.create,
+            model=self.model,
+            temperature=0.0,
+            max_tokens=2000
+        )
+    
+    def extract(self, web_results: List[Dict], raw_extraction: Dict, kb_shortcut: bool = False) -> Dict:
+        """
+        Extrai vigências usando LLM reasoning + Knowledge Base fallback
+        
+        Opcional (kb_shortcut=True): leis conhecidas com cronograma completo na Knowledge
+        Base (≥ KB_MIN_VIGENCIAS) são servidas direto dela, sem chamada ao LLM.
+        """
+        print("   📅 Extraindo datas e vigências via LLM reasoning...")
+        known_law_key, combined_content = self._prepare(web_results, raw_extraction)
+        
+        # Opcional: lei conhecida com cronograma completo é servida pela Knowledge Base
+        kb_vigencias = []
+        if HAS_KNOWLEDGE_BASE and known_law_key and kb_shortcut:
+            kb_vigencias = get_vigencias_for_legislation(known_law_key)
+        
+        if len(kb_vigencias) >= KB_MIN_VIGENCIAS:
+            print(f"   📚 Knowledge Base completa para {known_law_key}: {len(kb_vigencias)} vigências (LLM dispensado)")
+            vigencias = list(kb_vigencias)
+        # 🆕 v5.2: Se é lei conhecida e complexa, usa prompt especializado
+        elif known_law_key == "LC_214":
+            vigencias = self._extract_via_llm_reforma(combined_content)
+        else:
+            vigencias = self._extract_via_llm(combined_content)
+        
+        return self._finalize(vigencias, known_law_key, combined_content)
+    
+    def _prepare(self, web_results: List[Dict], raw_extraction: Dict) -> Tuple[Optional[str], str]:
+        """Consolida o conteúdo e detecta lei conhecida; retorna (known_law_key, combined_content)"""
+        content = self._consolidate_content(web_results)
+        raw_text = raw_extraction.get("raw_text", "")
+        
+        # 🆕 v5.2: Detecta se é uma lei conhecida ANTES de extrair
+        known_law_key = None
+        if HAS_KNOWLEDGE_BASE and web_results:
+            url = web_results[0].get('url', '')
+            title = web_results[0].get('title', '')
+            # LC 214 é a primeira regra do detector: um acerto pela URL (cacheado) já
+            # é o resultado final; os demais casos precisam da varredura do conteúdo
+            known_law_key = _detect_known_by_url(url)
+            if known_law_key != "LC_214":
+                known_law_key = detect_known_legislation(url, content, title)
+            
+            if known_law_key:
+                print(f"   📚 Lei conhecida detectada: {known_law_key}")
+        
+        # Único recorte do conteúdo (≤ 12 KB): o prompt da reforma usa-o inteiro,
+        # o genérico limita a 10 KB
+        combined_content = f"{content[:8000]}\n\n{raw_text[:4000]}"
+        return known_law_key, combined_content
+    
+    def _finalize(self, vigencias: List[Dict], known_law_key: Optional[str], combined_content: str) -> Dict:
+        """Aplica os fallbacks (Knowledge Base, regex), remove duplicatas e monta o resultado"""
+        # 🆕 v5.2: Se LLM encontrou pouco E temos knowledge base, usa fallback
+        if HAS_KNOWLEDGE_BASE and known_law_key:
+            if not vigencias or len(vigencias) < 3:
+                print(f"   📚 Usando Knowledge Base como fallback para {known_law_key}...")
+                kb_vigencias = get_vigencias_for_legislation(known_law_key)
+                if kb_vigencias:
+                    vigencias = kb_vigencias
+                    print(f"   ✅ Knowledge Base forneceu {len(vigencias)} vigências")
+        
+        # Fallback secundário: regex (se ainda não temos dados suficientes)
+        if not vigencias or len(vigencias) < 2:
+            print("   ⚠️  Usando fallback regex...")
+            vigencias_regex = self._extract_regex_fallback(combined_content)
+            vigencias.extend(vigencias_regex)
+            # Remove duplicatas entre LLM/KB e regex (mantém a primeira ocorrência)
+            seen = set()
+            unique = []
+            for v in vigencias:
+                data = v['data']
+                if data in seen:
+                    continue
+                seen.add(data)
+                unique.append(v)
+            vigencias = unique
+        
+        top = vigencias[:8]  # 🆕 v5.2: Aumentado para 8 (reforma tem muitas datas)
+        return {
+            "dates_text": "\n".join(f"{v['data']}: {v['contexto']}" for v in top),
+            "vigencias": top,
+            "count": len(top),
+            "known_law_key": known_law_key  # 🆕 v5.2: Passa a chave para outros agentes
+        }
+    
+    def _consolidate_content(self, web_results: List[Dict]) -> str:
+        """Consolida conteúdo das fontes (até 2 fontes × 5000 chars)"""
+        # Conteúdos curtos não são copiados: s[:5000] devolve o próprio objeto
+        return "\n\n".join(r['content'][:5000] for r in web_results[:2] if r.get('content'))
+    
+    def _extract_via_llm_reforma(self, content: str) -> List[Dict]:
+        """
+        🆕 v5.2 NOVO: Prompt especializado para REFORMA TRIBUTÁRIA (LC 214)
+        """
+        prompt = "".join((_REFORMA_PROMPT_HEAD, content, _REFORMA_PROMPT_TAIL))
+
+        return self._call_llm_and_parse(prompt)
+    
+    def _extract_via_llm(self, content: str) -> List[Dict]:
+        """
+        MÉTODO PRINCIPAL v5.1: Extrai vigências via LLM reasoning
+        COM TIPOS DE VIGÊNCIA MAIS CLAROS
+        """
+        
+        prompt = "".join((_EXTRACTION_PROMPT_HEAD, content[:10000], self._extraction_prompt_tail))
+
         return self._call_llm_and_parse(prompt)
     
     def _call_llm_and_parse(self, prompt: str) -> List[Dict]:
         """
         🆕 v5.2: Método auxiliar para chamar LLM e parsear resposta
         """
+        result = self._call_llm_json(prompt)
+        if result is None:
+            return []
+        
+        vigencias = self._normalize_vigencias(result.get("vigencias", []))
+        print(f"   ✅ LLM extraiu {len(vigencias)} vigências relevantes")
+        return vigencias
+    
+    def _call_llm_json(self, prompt: str) -> Optional[Dict]:
+        """Chama o LLM e devolve o objeto JSON da resposta (None em caso de erro)"""
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=2000
-            )
+            response = self._create(messages=[{"role": "user", "content": prompt}])
             
-            result_text = response.choices[0].message.content.strip()
-            
-            # Remove markdown se houver
-            result_text = re.sub(r'```json\s*', '', result_text)
-            result_text = re.sub(r'```\s*', '', result_text)
+            # Remove markdown se houver (cercas ``` e ```json)
+            result_text = strip_md_fence(response.choices[0].message.content)
             
             # Parse JSON
-            result = json.loads(result_text)
-            vigencias_raw = result.get("vigencias", [])
-            
-            # Filtra por relevância e valida
-            vigencias = []
-            for v in vigencias_raw:
-                if v.get("relevancia") in ["alta", "media"]:
-                    # ✅ v5.1: Adiciona emoji por tipo para clareza
-                    tipo = v.get("tipo", "")
-                    emoji = self._get_emoji_for_type(tipo)
-                    
-                    vigencias.append({
-                        'data': v.get("data", ""),
-                        'contexto': f"{emoji} {v.get('contexto', '')}".strip()[:180],
-                        'tipo': tipo,
-                        'relevancia': v.get("relevancia", "media")
-                    })
-            
-            # Ordena por relevância e tipo
-            vigencias.sort(key=lambda x: (
-                x['relevancia'] == 'alta',
-                x['tipo'] in ['inicio_vigencia', 'prazo_aquisicao', 'prazo_final']
-            ), reverse=True)
-            
-            print(f"   ✅ LLM extraiu {len(vigencias)} vigências relevantes")
-            return vigencias
+            result = orjson.loads(result_text)
+            if not isinstance(result, dict):
+                raise ValueError(f"JSON inesperado ({type(result).__name__})")
+            return result
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"   ⚠️  Erro ao parsear JSON do LLM: {e}")
-            return []
+            return None
         except Exception as e:
             print(f"   ⚠️  Erro na extração via LLM: {e}")
-            return []
+            return None
+    
+    def _normalize_vigencias(self, vigencias_raw: List[Dict]) -> List[Dict]:
+        """Filtra por relevância, valida o tipo, adiciona emoji e ordena"""
+        vigencias = []
+        for v in vigencias_raw:
+            if not isinstance(v, dict):
+                continue
+            if v.get("relevancia") in ["alta", "media"]:
+                # Tipo fora da lista do prompt vira "publicacao"
+                tipo = v.get("tipo")
+                if tipo not in _VALID_TIPOS:
+                    tipo = 'publicacao'
+                
+                # ✅ v5.1: Adiciona emoji por tipo para clareza
+                emoji = self._get_emoji_for_type(tipo)
+                
+                vigencias.append({
+                    'data': v.get("data", ""),
+                    'contexto': f"{emoji} {v.get('contexto', '')}".strip()[:180],
+                    'tipo': tipo,
+                    'relevancia': v.get("relevancia", "media")
+                })
+        
+        # Ordena por relevância e tipo (alta e tipos prioritários primeiro; estável)
+        vigencias.sort(key=lambda x: (
+            0 if x['relevancia'] == 'alta' else 1,
+            0 if x['tipo'] in _HIGH_PRIORITY_TIPOS else 1
+        ))
+        return vigencias
     
-    def _get_emoji_for_type(self, tipo: str) -> str:
+    @staticmethod
+    def _get_emoji_for_type(tipo: str) -> str:
         """
         ✅ v5.1 NOVO: Retorna emoji apropriado para cada tipo de vigência
         """
-        emoji_map = {
-            'inicio_vigencia': '🟢',      # Verde = início
-            'prazo_aquisicao': '⏰',      # Relógio = prazo
-            'duracao_beneficio': '📆',    # Calendário = duração
-            'prazo_permanencia': '🔒',    # Cadeado = obrigação
-            'prazo_transicao': '🔄',      # 🆕 v5.2: Setas = transição
-            'prazo_final': '🔴',          # Vermelho = fim
-            'publicacao': '📋',           # Documento
-        }
-        return emoji_map.get(tipo, '📅')
+        return _TIPO_EMOJI.get(tipo, '📅')
     
     def _extract_regex_fallback(self, content: str) -> List[Dict]:
         """
@@ -359,27 +471,9 @@ RESPONDA APENAS COM O JSON, SEM EXPLICAÇÕES ADICIONAIS."""
         vigencias = []
         seen = set()
         
-        # Padrões simples e diretos
-        patterns = [
-            # "vigência a partir de DD/MM/AAAA"
-            (r'vig[êe]ncia\s+a\s+partir\s+de\s+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', 'Início da vigência', 'inicio_vigencia'),
-            
-            # "até DD/MM/AAAA"
-            (r'at[ée]\s+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', 'Prazo até', 'prazo_aquisicao'),
-            
-            # "prazo de X anos"
-            (r'prazo\s+de\s+(\d+)\s+ano', 'Prazo de {} ano(s)', 'duracao_beneficio'),
-            
-            # "mínimo de X anos"
-            (r'm[íi]nimo\s+(?:de\s+)?(\d+)\s+ano', 'Prazo mínimo de {} ano(s)', 'prazo_permanencia'),
-            
-            # 🆕 v5.2: Padrões para reforma tributária
-            (r'a\s+partir\s+de\s+(202[5-9]|203[0-3])', 'A partir de {}', 'inicio_vigencia'),
-            (r'em\s+(202[5-9]|203[0-3])', 'Em {}', 'inicio_vigencia'),
-        ]
-        
-        for pattern, desc_template, tipo in patterns:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+        # Padrões simples e diretos (pré-compilados em _FALLBACK_PATTERNS)
+        for pattern, desc_template, tipo in _FALLBACK_PATTERNS:
+            for match in pattern.finditer(content):
                 try:
                     groups = match.groups()
                     
@@ -390,7 +484,7 @@ RESPONDA APENAS COM O JSON, SEM EXPLICAÇÕES ADICIONAIS."""
                         data = groups[0]
                         
                         # Valida ano >= atual
-                        year_match = re.search(r'20\d{2}', str(data))
+                        year_match = _YEAR_RE.search(data)  # groups[0] já é str
                         if year_match and int(year_match.group(0)) < self.current_year:
                             continue
                         
@@ -8,15 +8,386 @@ CORREÇÕES v4.9:
 5. ✅ NOVO: Aceita known_law_key para integração com Knowledge Base
 """
 
-from typing import List, Dict
+from collections import defaultdict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Optional
 from openai import OpenAI
 import re
-from config import *
+from config import (
+    DEV_GENAI_API_KEY,
+    DEV_GENAI_API_URL,
+    MODEL_NAME
+)
+
+# Padrões compilados uma vez no import (antes: literais recompilados/buscados
+# no cache do módulo re a cada relatório)
+
+# Identificação da legislação: por família, padrões em ordem de prioridade (o primeiro
+# padrão que casar em qualquer ponto do texto vence, como na versão original)
+_LEGISLATION_RES = {
+    'lc': (
+        re.compile(r'Lei\s+Complementar\s*n?º?\s*(\d+(?:\.\d+)?)', re.IGNORECASE),
+        re.compile(r'LC\s*n?º?\s*(\d+(?:\.\d+)?)', re.IGNORECASE),
+        re.compile(r'/lcp?(\d+)', re.IGNORECASE),
+    ),
+    'mp': (
+        re.compile(r'(?:MP|MPV)\s*n?º?\s*(\d+)', re.IGNORECASE),
+        re.compile(r'mpv(\d+)', re.IGNORECASE),
+    ),
+    'lei': (re.compile(r'Lei\s*n?º?\s*([\d.]+)', re.IGNORECASE),),
+    'dec': (re.compile(r'Decreto\s*n?º?\s*([\d.]+)', re.IGNORECASE),),
+}
+# Datas - APENAS ANOS RECENTES (2024+). Prioridade: uma data numérica em qualquer
+# ponto do texto vence uma data por extenso, mesmo que esta apareça antes
+_DATE_RES = (
+    re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](202[4-9])'),
+    re.compile(r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(202[4-9])', re.IGNORECASE),
+)
+_MESES = MappingProxyType({
+    'janeiro': '01', 'fevereiro': '02', 'março': '03', 'abril': '04',
+    'maio': '05', 'junho': '06', 'julho': '07', 'agosto': '08',
+    'setembro': '09', 'outubro': '10', 'novembro': '11', 'dezembro': '12'
+})
+
+# Resumo executivo, em ordem de prioridade: ementa/objetivo rotulado (pode ocupar várias
+# linhas, até "\n\n", "**" ou "N."), senão frase "institui/altera/dispõe". O rótulo é
+# limitado a RESUMO_SCAN_CHARS em vez de um .*? DOTALL sem fim; o texto é truncado a 800
+# depois, então um trecho maior não muda o resultado
+RESUMO_SCAN_CHARS = 4000
+_RESUMO_RES = (
+    re.compile(
+        r'(?:Objetivo|Ementa|Resumo)[:\s]+'
+        rf'(?s:(.{{0,{RESUMO_SCAN_CHARS}}}?)(?=\n\n|\*\*|\d+\.)|(.{{{RESUMO_SCAN_CHARS}}}))',
+        re.IGNORECASE
+    ),
+    re.compile(r'(?:institui|altera|dispõe)[^\n]{50,600}', re.IGNORECASE),
+)
+RESUMO_MIN_CHARS = 80
+
+# ✅ v4.8.1 FIX: Padrões RIGOROSOS com word boundaries (ordem = prioridade da chave)
+_VALIDATION_PATTERNS = {
+    'pis': [r'\bpis\b', r'programa de integração social'],
+    'cofins': [r'\bcofins\b', r'contribuição para financiamento'],
+    'ipi': [r'\bipi\b', r'imposto sobre produtos industrializados'],
+    'icms': [r'\bicms\b', r'imposto sobre circulação'],
+    # ✅ v4.8.1 FIX CRÍTICO: ISS precisa de validação rigorosa
+    'iss': [
+        r'\bissqn\b',
+        r'\biss\b(?!\s*[oa])',  # "iss" mas não "isso", "issa"
+        r'imposto sobre serviços',
+        r'imposto s(?:obre|/)?\s*serviços',
+    ],
+    'ii': [
+        r'\bii\b(?!\s*[,\.]?\s*(?:iii|iv|v|do|da|de|e)\b)',  # II mas não "II, III" ou "II do"
+        r'imposto de importação',
+    ],
+    # Novos tributos - Reforma Tributária
+    'ibs': [r'\bibs\b', r'imposto sobre bens e serviços'],
+    'cbs': [r'\bcbs\b', r'contribuição sobre bens e serviços'],
+    'is': [
+        r'\bis\b(?=\s+(?:incid|será|sobre|produto))',  # IS com contexto
+        r'\bimposto seletivo\b',
+    ],
+}
+
+# Todos os tributos numa alternância com um grupo nomeado por chave (uma varredura).
+# re do stdlib: \b Unicode (acentos são letras, "papéis" não contém "is") e lookarounds.
+# Sem IGNORECASE: os padrões são minúsculos e o texto validado já vem em .lower()
+# (assemble), o que deixa o motor usar a busca literal rápida em vez da case-folded
+_TRIBUTO_SCAN_RE = re.compile('|'.join(
+    f"(?P<{key}>{'|'.join(patterns)})" for key, patterns in _VALIDATION_PATTERNS.items()
+))
+
+
+def _tributos_presentes(text: str) -> frozenset:
+    """
+    Tributos citados no texto (já em minúsculas) numa ÚNICA varredura.
+    Calculado uma vez por assemble: a seção 3 valida até 15 tributos contra o mesmo conjunto
+    """
+    return frozenset(match.lastgroup for match in _TRIBUTO_SCAN_RE.finditer(text))
+
+
+# Cronograma de transição: termos que identificam legislação da Reforma Tributária (uma busca só)
+_REFORMA_RE = re.compile(
+    r'\b(?:ibs|cbs|imposto seletivo|reforma tributária|lc\s*214|lei complementar\s*214)\b',
+    re.IGNORECASE
+)
+
+# Seção fixa (sem variáveis): montada uma vez no import
+_CRONOGRAMA_STATIC = """
+================================================================================
+📅 CRONOGRAMA DE TRANSIÇÃO - REFORMA TRIBUTÁRIA
+================================================================================
+
+A Reforma Tributária estabelece período de transição de 2026 a 2033:
+
+📊 CRONOGRAMA DE ALÍQUOTAS:
+
+| Ano  | CBS (Federal)    | IBS (Est/Mun)    | PIS/COFINS   | ICMS/ISS     |
+|------|------------------|------------------|--------------|--------------|
+| 2026 | 0,9% (teste)     | 0,1% (teste)     | 100%         | 100%         |
+| 2027 | Alíquota cheia   | Aumenta          | Reduz        | 100%         |
+| 2029 | 100%             | Aumenta          | Reduz        | 90%          |
+| 2030 | 100%             | Aumenta          | Reduz        | 80%          |
+| 2031 | 100%             | Aumenta          | Reduz        | 70%          |
+| 2032 | 100%             | Aumenta          | Reduz        | 60%          |
+| 2033 | 100%             | 100%             | EXTINTO      | EXTINTO      |
+
+📌 ALÍQUOTAS DE REFERÊNCIA:
+   • CBS (Contribuição sobre Bens e Serviços): ~8,8%
+   • IBS (Imposto sobre Bens e Serviços): ~17,7%
+   • Total IVA Dual (CBS + IBS): ~26,5%
+
+⚠️  IMPACTO PARA DELL:
+   • Necessidade de atualizar ERP para novos tributos
+   • Período de convivência entre sistemas antigo e novo
+   • Crédito amplo (inclusive serviços) no novo sistema
+   • Cobrança no destino beneficia operações interestaduais
+"""
+
+# Rodapé: só depende de MODEL_NAME (config), também montado uma vez
+_REPORT_FOOTER = f"""
+================================================================================
+⚙️  Sistema: Dell GenAI | Modelo: {MODEL_NAME}
+🗃️  Arquitetura: 13 Agentes Especializados
+🎯 Análise específica para Dell Technologies Brazil
+================================================================================
+"""
+
+# Vigências: tipo -> grupo, e grupos na ordem em que aparecem no relatório
+_VIGENCIA_BUCKET = MappingProxyType({
+    'inicio_vigencia': 'inicio',
+    'prazo_aquisicao': 'prazos',
+    'duracao_beneficio': 'duracoes',
+    'prazo_permanencia': 'duracoes',
+})
+_VIGENCIA_SECTIONS = (
+    ('inicio', "\n🟢 INÍCIO DE VIGÊNCIA:\n"),
+    ('prazos', "\n⏰ PRAZOS-LIMITE PARA OPERAÇÃO:\n"),
+    ('duracoes', "\n📆 DURAÇÃO DO BENEFÍCIO / PRAZO DE PERMANÊNCIA:\n"),
+    ('outros', "\n📋 OUTRAS DATAS:\n"),
+)
+
+# Detalhamento técnico
+_ART_RE = re.compile(r'Art\.?\s*\d+[A-Z-]*[^\n]{20,300}', re.IGNORECASE)
+_ART_KEYWORDS_RE = re.compile(r'suspensão|tributo|alíquota|vigência|benefício|isenção|redata', re.IGNORECASE)
+MAX_ARTIGOS = 8
+
+# Limpeza de campos (_clean_field): rótulos numa única passada, resíduo em seguida.
+# Obs: "\s+c) CONDIÇÕES.*$" e "\s+d) ⚠️.*$" nunca casavam na versão sequencial
+# (os dois primeiros padrões já removiam todo "c) CONDIÇÕES" / "d) ⚠️"), então
+# não entram na alternância - onde passariam a cortar o resto do campo.
+_FIELD_CLEANUP_RE = re.compile(
+    r'c\)\s*CONDIÇÕES[:\s]*'
+    r'|d\)\s*(?:RISCOS?|⚠️)[:\s]*',
+    re.IGNORECASE
+)
+# Segunda passada: o resíduo "estabelecidas." só fica no início DEPOIS de retirar o rótulo
+_FIELD_RESIDUE_RE = re.compile(r'^estabelecidas\.\s*', re.IGNORECASE)
+
+# Remoção de markdown (_clean_markdown): caracteres soltos saem via str.replace (busca em C,
+# sem motor de regex). A ordem das passadas é a original: uma remoção pode juntar vizinhos
+# num novo padrão ("-━--" vira "---"), então cada padrão tem a sua passada, na mesma ordem.
+# Obs: str.translate seria o natural, mas com '━'/'─' (não-ASCII) sai do caminho rápido e
+# fica mais lento que a própria regex
+_MD_UNDERSCORES = re.compile(r'__+')
+_MD_HEADING = re.compile(r'#+\s*')
+_MD_RULE_CHARS = ('━', '─')
+_MD_DASH_RULE = re.compile(r'-{3,}')
+_MD_EQUALS_RULE = re.compile(r'={3,}')
+# Marcadores de lista por último: em uma alternância, "^\s*[-•]" casava no "\n" de uma
+# linha em branco e comia um traço de "---"
+_MD_BULLET = re.compile(r'^\s*[-•]\s*', re.MULTILINE)
+
+
+def _find_legislation_number(text: str, kind: str) -> Optional[str]:
+    """Número de legislação da família `kind` ('lc', 'mp', 'lei', 'dec'): padrões em ordem de prioridade"""
+    for pattern in _LEGISLATION_RES[kind]:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _identify_legislation_info_v481(web_results: List[Dict], structured_data: Dict) -> tuple:
+    """
+    ✅ v4.8.1 FIX Bug 3: Identifica tipo, número e data da legislação
+    NOVO: Suporte a Lei Complementar (LC 214)
+    """
+    tipo = "LEGISLAÇÃO"
+    numero = "Número não identificado"
+    data = "Data não identificada"
+    
+    if web_results:
+        title = web_results[0].get('title', '')
+        url = web_results[0].get('url', '')
+        content = web_results[0].get('content', '')[:2000]
+    
+        search_text = f"{title} {url} {content}"
+    
+        # ✅ v4.8.1 FIX: Lei Complementar ANTES de Lei simples
+        if 'lei complementar' in search_text.lower() or 'lc ' in search_text.lower() or '/lcp/' in url.lower():
+            tipo = "LEI COMPLEMENTAR"
+            lc_num = _find_legislation_number(search_text, 'lc')
+            if lc_num:
+                numero = f"LC nº {lc_num}"
+    
+        # Medida Provisória
+        elif 'MP' in title.upper() or 'MEDIDA' in title.upper() or 'mpv' in url.lower():
+            tipo = "MEDIDA PROVISÓRIA (MPV)"
+            mp_num = _find_legislation_number(title + ' ' + url, 'mp')
+            if mp_num:
+                numero = f"MPV nº {mp_num}"
+    
+        # Lei (simples)
+        elif 'LEI' in title.upper():
+            tipo = "LEI"
+            lei_num = _find_legislation_number(title, 'lei')
+            if lei_num:
+                numero = f"Lei nº {lei_num}"
+    
+        # Decreto
+        elif 'DECRETO' in title.upper():
+            tipo = "DECRETO"
+            dec_num = _find_legislation_number(title, 'dec')
+            if dec_num:
+                numero = f"Decreto nº {dec_num}"
+    
+        # Extrai data - APENAS ANOS RECENTES (2024+)
+        for date_re in _DATE_RES:
+            date_match = date_re.search(search_text)
+            if date_match:
+                dia, mes, ano = date_match.groups()
+                mes_num = mes if mes.isdigit() else _MESES.get(mes.lower(), '??')
+                data = f"{dia}/{mes_num}/{ano}"
+                break
+    
+    return tipo, numero, data
+
+
+def _validate_tributo_display_v481(tributo_nome: str, tributos_presentes: frozenset) -> bool:
+    """
+    ✅ v4.8.1 FIX Bug 1: Validação RIGOROSA de tributos
+    Usa word boundaries para evitar falsos positivos
+    tributos_presentes vem de _tributos_presentes(original_text)
+    """
+    tributo_lower = tributo_nome.lower()
+    
+    # Identifica qual tributo verificar
+    tributo_key = None
+    for key in _VALIDATION_PATTERNS:
+        if key in tributo_lower:
+            tributo_key = key
+            break
+    
+    if tributo_key is None:
+        return True  # Tributo não mapeado, permite por padrão
+    
+    return tributo_key in tributos_presentes
+
+
+def _deduplicate_risks(risks: List[str]) -> List[str]:
+    """Remove duplicatas semânticas de riscos"""
+    if not risks:
+        return []
+    
+    concepts = {
+        'incorporacao': [],
+        'alienacao': [],
+        'compromisso': [],
+        'outros': []
+    }
+    
+    for risk in risks:
+        risk_lower = risk.lower()
+    
+        if 'incorporar' in risk_lower or 'ativo' in risk_lower:
+            concepts['incorporacao'].append(risk)
+        elif 'alienar' in risk_lower or '5 anos' in risk_lower:
+            concepts['alienacao'].append(risk)
+        elif 'compromisso' in risk_lower or 'p&d' in risk_lower:
+            concepts['compromisso'].append(risk)
+        else:
+            concepts['outros'].append(risk)
+    
+    unique = []
+    for concept, items in concepts.items():
+        if items:
+            best = max(items, key=len) if len(items) > 1 else items[0]
+            unique.append(best)
+    
+    return unique
+
+
+def _clean_field(text: str, max_length: int) -> str:
+    """Limpa e trunca campos"""
+    if not text:
+        return text
+    
+    text = _FIELD_RESIDUE_RE.sub('', _FIELD_CLEANUP_RE.sub('', text))
+    text = ' '.join(text.split())
+    
+    return _smart_truncate(text, max_length)
+
+
+# Entradas são str/int imutáveis e se repetem entre seções (contextos, justificativas,
+# riscos duplicados): memoriza o resultado por (texto, tamanho)
+@lru_cache(maxsize=1024)
+def _clean_markdown(text: str) -> str:
+    """Remove markdown e formatação do texto"""
+    if not text:
+        return text
+    
+    text = _MD_HEADING.sub('', _MD_UNDERSCORES.sub('', text.replace('*', '')))
+    for char in _MD_RULE_CHARS:
+        text = text.replace(char, '')
+    text = _MD_EQUALS_RULE.sub('', _MD_DASH_RULE.sub('', text))
+    
+    return ' '.join(_MD_BULLET.sub('', text).split())
+
+
+@lru_cache(maxsize=1024)
+def _smart_truncate(text: str, max_length: int) -> str:
+    """Trunca texto de forma inteligente"""
+    if not text:
+        return text
+    
+    # _clean_markdown já normaliza os espaços
+    text = _clean_markdown(text)
+    
+    if len(text) <= max_length:
+        return text
+    
+    truncated = text[:max_length]
+    
+    last_period = truncated.rfind('.')
+    last_exclamation = truncated.rfind('!')
+    last_question = truncated.rfind('?')
+    last_punct = max(last_period, last_exclamation, last_question)
+    
+    if last_punct > max_length * 0.5:
+        return truncated[:last_punct + 1].strip()
+    
+    last_comma = truncated.rfind(',')
+    last_semicolon = truncated.rfind(';')
+    last_secondary = max(last_comma, last_semicolon)
+    
+    if last_secondary > max_length * 0.7:
+        return truncated[:last_secondary].strip() + '.'
+    
+    last_space = truncated.rfind(' ')
+    if last_space > max_length * 0.5:
+        return truncated[:last_space].strip() + '...'
+    
+    return truncated.strip() + '...'
 
 
 class FinalAssemblyAgent:
     """Agente de montagem final - v4.9 com Knowledge Base integration"""
     
+    __slots__ = ('client', 'model')
+    
     def __init__(self):
         self.client = OpenAI(
             api_key=DEV_GENAI_API_KEY,
@@ -31,108 +402,35 @@ class FinalAssemblyAgent:
         """Monta relatório final ultra claro - v4.9 com Knowledge Base"""
         print("   📝 Montando relatório final (v4.9)...")
         
-        tipo_leg, numero_leg, data_pub = self._identify_legislation_info_v481(web_results, structured_data)
+        tipo_leg, numero_leg, data_pub = _identify_legislation_info_v481(web_results, structured_data)
         
         # ✅ v4.8.1: Extrai texto original para validação
         original_text = ""
         if web_results:
             original_text = web_results[0].get('content', '').lower()
+        # Tributos presentes: uma varredura por relatório (None = sem texto, não filtra)
+        tributos_presentes = _tributos_presentes(original_text) if original_text else None
+        
+        parts = [
+            self._build_header(tipo_leg, numero_leg, data_pub),
+            self._build_resumo_executivo(structured_data, dell_analysis),
+            self._build_mudancas_sistema_improved(system_changes),
+            self._build_impacto_tributos_v481(system_changes, web_results, tributos_presentes),
+            self._build_vigencias_TYPED(date_extraction),
+            self._build_compliance_risks(system_changes),
+        ]
         
-        report_sections = {
-            'header': self._build_header(tipo_leg, numero_leg, data_pub),
-            'resumo_executivo': self._build_resumo_executivo(structured_data, dell_analysis),
-            'mudancas_sistema': self._build_mudancas_sistema_improved(system_changes),
-            'impacto_tributos': self._build_impacto_tributos_v481(system_changes, web_results, original_text),
-            'vigencias': self._build_vigencias_TYPED(date_extraction),
-            'compliance_risks': self._build_compliance_risks(system_changes),
-            'cronograma_transicao': self._build_cronograma_transicao(system_changes, original_text),  # ✅ NOVO
-            'acoes_requeridas': self._build_acoes_requeridas(dell_analysis, system_changes),
-            'detalhamento_tecnico': self._build_detalhamento_tecnico(structured_data),
-            'fontes': self._build_fontes(web_results)
-        }
-        
-        report = self._assemble_final_report(report_sections)
-        return report
-    
-    def _identify_legislation_info_v481(self, web_results: List[Dict], structured_data: Dict) -> tuple:
-        """
-        ✅ v4.8.1 FIX Bug 3: Identifica tipo, número e data da legislação
-        NOVO: Suporte a Lei Complementar (LC 214)
-        """
-        tipo = "LEGISLAÇÃO"
-        numero = "Número não identificado"
-        data = "Data não identificada"
+        # ✅ v4.8.1: Cronograma de transição (só aparece se for Reforma Tributária)
+        cronograma = self._build_cronograma_transicao(system_changes, original_text)
+        if cronograma:
+            parts.append(cronograma)
         
-        if web_results:
-            title = web_results[0].get('title', '')
-            url = web_results[0].get('url', '')
-            content = web_results[0].get('content', '')[:2000]
-            
-            search_text = f"{title} {url} {content}"
-            
-            # ✅ v4.8.1 FIX: Lei Complementar ANTES de Lei simples
-            if 'lei complementar' in search_text.lower() or 'lc ' in search_text.lower() or '/lcp/' in url.lower():
-                tipo = "LEI COMPLEMENTAR"
-                # Padrões para LC
-                lc_patterns = [
-                    r'Lei\s+Complementar\s*n?º?\s*(\d+(?:\.\d+)?)',
-                    r'LC\s*n?º?\s*(\d+(?:\.\d+)?)',
-                    r'/lcp?(\d+)',
-                ]
-                for pattern in lc_patterns:
-                    match = re.search(pattern, search_text, re.IGNORECASE)
-                    if match:
-                        numero = f"LC nº {match.group(1)}"
-                        break
-            
-            # Medida Provisória
-            elif 'MP' in title.upper() or 'MEDIDA' in title.upper() or 'mpv' in url.lower():
-                tipo = "MEDIDA PROVISÓRIA (MPV)"
-                mp_patterns = [r'(?:MP|MPV)\s*n?º?\s*(\d+)', r'mpv(\d+)']
-                for pattern in mp_patterns:
-                    match = re.search(pattern, title + ' ' + url, re.IGNORECASE)
-                    if match:
-                        numero = f"MPV nº {match.group(1)}"
-                        break
-            
-            # Lei (simples)
-            elif 'LEI' in title.upper():
-                tipo = "LEI"
-                lei_match = re.search(r'Lei\s*n?º?\s*([\d.]+)', title, re.IGNORECASE)
-                if lei_match:
-                    numero = f"Lei nº {lei_match.group(1)}"
-            
-            # Decreto
-            elif 'DECRETO' in title.upper():
-                tipo = "DECRETO"
-                dec_match = re.search(r'Decreto\s*n?º?\s*([\d.]+)', title, re.IGNORECASE)
-                if dec_match:
-                    numero = f"Decreto nº {dec_match.group(1)}"
-            
-            # Extrai data - APENAS ANOS RECENTES (2024+)
-            date_patterns = [
-                r'(\d{1,2})[/-](\d{1,2})[/-](202[4-9])',
-                r'(\d{1,2})\s+de\s+(\w+)\s+de\s+(202[4-9])',
-            ]
-            
-            for pattern in date_patterns:
-                date_match = re.search(pattern, search_text, re.IGNORECASE)
-                if date_match:
-                    groups = date_match.groups()
-                    if len(groups) == 3:
-                        if groups[1].isdigit():
-                            data = f"{groups[0]}/{groups[1]}/{groups[2]}"
-                        else:
-                            meses = {
-                                'janeiro': '01', 'fevereiro': '02', 'março': '03', 'abril': '04',
-                                'maio': '05', 'junho': '06', 'julho': '07', 'agosto': '08',
-                                'setembro': '09', 'outubro': '10', 'novembro': '11', 'dezembro': '12'
-                            }
-                            mes_num = meses.get(groups[1].lower(), '??')
-                            data = f"{groups[0]}/{mes_num}/{groups[2]}"
-                    break
+        parts.append(self._build_acoes_requeridas(dell_analysis, system_changes))
+        parts.append(self._build_detalhamento_tecnico(structured_data))
+        parts.append(self._build_fontes(web_results))
+        parts.append(self._build_footer())
         
-        return tipo, numero, data
+        return ''.join(parts)
     
     def _build_header(self, tipo: str, numero: str, data: str) -> str:
         """Cabeçalho do relatório"""
@@ -152,23 +450,14 @@ class FinalAssemblyAgent:
         
         resumo = ""
         if raw_text:
-            patterns = [
-                r'(?:Objetivo|Ementa|Resumo)[:\s]+(.*?)(?:\n\n|\*\*|\d+\.)',
-                r'(?:institui|altera|dispõe)[^\n]{50,600}',
-            ]
-            
-            for pattern in patterns:
-                match = re.search(pattern, raw_text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+            for pattern in _RESUMO_RES:
+                match = pattern.search(raw_text)
                 if match:
-                    try:
-                        resumo = match.group(1) if match.lastindex and match.lastindex >= 1 else match.group(0)
-                    except IndexError:
-                        resumo = match.group(0)
-                    resumo = resumo.strip()
-                    if len(resumo) > 80:
+                    resumo = next((g for g in match.groups() if g is not None), match.group(0)).strip()
+                    if len(resumo) > RESUMO_MIN_CHARS:
                         break
             
-            if not resumo or len(resumo) < 80:
+            if len(resumo) < RESUMO_MIN_CHARS:
                 lines = [l.strip() for l in raw_text.split('\n') if l.strip()]
                 summary_lines = []
                 char_count = 0
@@ -185,11 +474,11 @@ class FinalAssemblyAgent:
         if not resumo or len(resumo) < 50:
             resumo = "Resumo não disponível. Consulte o detalhamento técnico."
         
-        resumo = self._smart_truncate(resumo, 800)
+        resumo = _smart_truncate(resumo, 800)
         
         relevancia = dell_analysis.get("relevancia", "NÃO DETERMINADA")
         justificativa_raw = dell_analysis.get("justificativa", "Justificativa não disponível")
-        justificativa = self._smart_truncate(justificativa_raw, 700)
+        justificativa = _smart_truncate(justificativa_raw, 700)
         
         return f"""
 ================================================================================
@@ -212,84 +501,85 @@ class FinalAssemblyAgent:
         tipos_cliente = system_changes.get('tipos_cliente', [])
         parametrizacoes = system_changes.get('parametrizacoes', [])
         
-        section = f"""
+        parts = [f"""
 ================================================================================
 2️⃣  MUDANÇAS NECESSÁRIAS NO SISTEMA
 ================================================================================
 
 ⚙️  MUDANÇAS DE ALÍQUOTAS E TRIBUTOS:
-"""
+"""]
         
         if aliquotas and len(aliquotas) > 0:
             for i, aliq in enumerate(aliquotas[:10], 1):
                 tributo = aliq.get('tributo', 'N/A')
                 tipo_mudanca = aliq.get('tipo_mudanca', '')
                 
-                situacao_nova = self._clean_field(aliq.get('situacao_nova', ''), 500)
-                condicoes = self._clean_field(aliq.get('condicoes', ''), 450)
-                vigencia = self._clean_field(aliq.get('vigencia', ''), 250)
-                descricao = self._smart_truncate(aliq.get('descricao_completa', aliq.get('descricao', '')), 500)
+                situacao_nova = _clean_field(aliq.get('situacao_nova', ''), 500)
+                condicoes = _clean_field(aliq.get('condicoes', ''), 450)
+                vigencia = _clean_field(aliq.get('vigencia', ''), 250)
+                descricao = _smart_truncate(aliq.get('descricao_completa', aliq.get('descricao', '')), 500)
                 
-                section += f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-                section += f"{i}. TRIBUTO: {tributo}\n"
+                parts.append(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+                parts.append(f"{i}. TRIBUTO: {tributo}\n")
                 
                 if tipo_mudanca:
-                    section += f"   MUDANÇA: {tipo_mudanca}\n"
+                    parts.append(f"   MUDANÇA: {tipo_mudanca}\n")
                 
                 if situacao_nova and situacao_nova not in tipo_mudanca:
-                    section += f"   NOVA SITUAÇÃO: {situacao_nova}\n"
+                    parts.append(f"   NOVA SITUAÇÃO: {situacao_nova}\n")
                 
                 if condicoes:
                     if 'quem pode' in condicoes.lower()[:30]:
-                        section += f"   QUEM PODE: {condicoes}\n"
+                        parts.append(f"   QUEM PODE: {condicoes}\n")
                     else:
-                        section += f"   CONDIÇÕES: {condicoes}\n"
+                        parts.append(f"   CONDIÇÕES: {condicoes}\n")
                 
                 if vigencia:
-                    section += f"   VIGÊNCIA: {vigencia}\n"
+                    parts.append(f"   VIGÊNCIA: {vigencia}\n")
                 
                 if descricao and not all([tipo_mudanca, situacao_nova, condicoes, vigencia]):
-                    section += f"   DETALHES: {descricao}\n"
+                    parts.append(f"   DETALHES: {descricao}\n")
         else:
-            section += "\n⚠️  Mudanças de alíquotas não identificadas automaticamente."
-            section += "\n   Consulte a seção 'Detalhamento Técnico' e a legislação completa.\n"
+            parts.append("\n⚠️  Mudanças de alíquotas não identificadas automaticamente.")
+            parts.append("\n   Consulte a seção 'Detalhamento Técnico' e a legislação completa.\n")
         
-        section += f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-        section += f"\n📋 OPERAÇÕES AFETADAS:"
+        parts.append(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+        parts.append(f"\n📋 OPERAÇÕES AFETADAS:")
         if operacoes:
             for op in operacoes[:8]:
-                section += f"\n   • {op}"
+                parts.append(f"\n   • {op}")
         else:
-            section += "\n   • Verificar legislação"
+            parts.append("\n   • Verificar legislação")
         
-        section += f"\n\n👥 TIPOS DE CLIENTE/EMPRESA BENEFICIÁRIA:"
+        parts.append(f"\n\n👥 TIPOS DE CLIENTE/EMPRESA BENEFICIÁRIA:")
         if tipos_cliente:
             for cliente in tipos_cliente[:8]:
-                section += f"\n   • {cliente}"
+                parts.append(f"\n   • {cliente}")
         else:
-            section += "\n   • Verificar legislação"
+            parts.append("\n   • Verificar legislação")
         
-        section += f"\n\n🔧 PARAMETRIZAÇÕES NECESSÁRIAS NO ERP:"
+        parts.append(f"\n\n🔧 PARAMETRIZAÇÕES NECESSÁRIAS NO ERP:")
         if parametrizacoes:
             for param in parametrizacoes[:10]:
-                section += f"\n   • {param}"
+                parts.append(f"\n   • {param}")
         else:
-            section += "\n   • A definir após análise detalhada"
+            parts.append("\n   • A definir após análise detalhada")
         
-        return section
+        return ''.join(parts)
     
-    def _build_impacto_tributos_v481(self, system_changes: Dict, web_results: List[Dict], original_text: str) -> str:
+    def _build_impacto_tributos_v481(self, system_changes: Dict, web_results: List[Dict],
+                                    tributos_presentes: Optional[frozenset]) -> str:
         """
         ✅ v4.8.1 FIX Bug 1: Impacto por tributo COM VALIDAÇÃO RIGOROSA
         ISS só aparece se realmente estiver na legislação original
         """
         tributos = system_changes.get('tributos_afetados', [])
         
-        section = f"""
+        parts = [f"""
 ================================================================================
 3️⃣  IMPACTO POR TRIBUTO
 ================================================================================
-"""
+"""]
         
         if tributos and len(tributos) > 0:
             tributos_validos = 0
@@ -299,259 +589,107 @@ class FinalAssemblyAgent:
                 contexto_raw = trib.get('contexto', '')
                 
                 # ✅ v4.8.1 FIX: Validação RIGOROSA antes de exibir
-                if original_text and not self._validate_tributo_display_v481(tributo_nome, original_text):
+                if tributos_presentes is not None and not _validate_tributo_display_v481(tributo_nome, tributos_presentes):
                     print(f"   🧹 Removido da seção 3: '{tributo_nome}' - não encontrado na fonte original")
                     continue
                 
-                contexto = self._smart_truncate(contexto_raw, 300)
+                contexto = _smart_truncate(contexto_raw, 300)
                 
                 if not tipo_mudanca and not contexto:
                     continue
                 
-                section += f"\n💰 {tributo_nome}:"
+                parts.append(f"\n💰 {tributo_nome}:")
                 if tipo_mudanca:
-                    section += f" [{tipo_mudanca}]"
+                    parts.append(f" [{tipo_mudanca}]")
                 
                 if contexto:
-                    section += f"\n   {contexto}"
+                    parts.append(f"\n   {contexto}")
                 
-                section += "\n"
+                parts.append("\n")
                 tributos_validos += 1
             
             if tributos_validos == 0:
-                section += "\n⚠️  Detalhamento de tributos não disponível."
-                section += "\n   Consulte a seção de mudanças no sistema.\n"
+                parts.append("\n⚠️  Detalhamento de tributos não disponível.")
+                parts.append("\n   Consulte a seção de mudanças no sistema.\n")
         else:
-            section += "\n⚠️  Detalhamento de tributos não disponível."
-            section += "\n   Consulte a seção de mudanças no sistema.\n"
+            parts.append("\n⚠️  Detalhamento de tributos não disponível.")
+            parts.append("\n   Consulte a seção de mudanças no sistema.\n")
         
-        return section
-    
-    def _validate_tributo_display_v481(self, tributo_nome: str, original_content: str) -> bool:
-        """
-        ✅ v4.8.1 FIX Bug 1: Validação RIGOROSA de tributos
-        Usa word boundaries para evitar falsos positivos
-        """
-        tributo_lower = tributo_nome.lower()
-        
-        # ✅ v4.8.1 FIX: Padrões RIGOROSOS com word boundaries
-        validation_patterns = {
-            'pis': [r'\bpis\b', r'programa de integração social'],
-            'cofins': [r'\bcofins\b', r'contribuição para financiamento'],
-            'ipi': [r'\bipi\b', r'imposto sobre produtos industrializados'],
-            'icms': [r'\bicms\b', r'imposto sobre circulação'],
-            # ✅ v4.8.1 FIX CRÍTICO: ISS precisa de validação rigorosa
-            'iss': [
-                r'\biss\b(?!\s*[oaO])',  # "iss" mas não "isso", "issa"
-                r'\bissqn\b',
-                r'imposto sobre serviços',
-                r'imposto s(?:obre|/)?\s*serviços',
-            ],
-            'ii': [
-                r'\bii\b(?!\s*[,\.]?\s*(?:iii|iv|v|do|da|de|e)\b)',  # II mas não "II, III" ou "II do"
-                r'imposto de importação',
-            ],
-            # Novos tributos - Reforma Tributária
-            'ibs': [r'\bibs\b', r'imposto sobre bens e serviços'],
-            'cbs': [r'\bcbs\b', r'contribuição sobre bens e serviços'],
-            'is': [
-                r'\bimposto seletivo\b',
-                r'\bis\b(?=\s+(?:incid|será|sobre|produto))',  # IS com contexto
-            ],
-        }
-        
-        # Identifica qual tributo verificar
-        tributo_key = None
-        for key in validation_patterns.keys():
-            if key in tributo_lower:
-                tributo_key = key
-                break
-        
-        if tributo_key is None:
-            return True  # Tributo não mapeado, permite por padrão
-        
-        patterns = validation_patterns[tributo_key]
-        
-        for pattern in patterns:
-            if re.search(pattern, original_content, re.IGNORECASE):
-                return True
-        
-        return False
+        return ''.join(parts)
     
     def _build_vigencias_TYPED(self, date_extraction: Dict) -> str:
         """Vigências organizadas por TIPO"""
         vigencias = date_extraction.get("vigencias", [])
         
-        section = f"""
+        parts = [f"""
 ================================================================================
 4️⃣  VIGÊNCIAS E PRAZOS CRÍTICOS
 ================================================================================
 
 📅 DATAS IMPORTANTES:
-"""
+"""]
         
         if vigencias:
-            inicio_vigencia = []
-            prazos_aquisicao = []
-            duracoes_beneficio = []
-            outros = []
-            
+            # Uma passada para agrupar por tipo
+            buckets = defaultdict(list)
             for v in vigencias:
-                tipo = v.get('tipo', '')
-                if tipo == 'inicio_vigencia':
-                    inicio_vigencia.append(v)
-                elif tipo == 'prazo_aquisicao':
-                    prazos_aquisicao.append(v)
-                elif tipo in ['duracao_beneficio', 'prazo_permanencia']:
-                    duracoes_beneficio.append(v)
-                else:
-                    outros.append(v)
-            
-            if inicio_vigencia:
-                section += "\n🟢 INÍCIO DE VIGÊNCIA:\n"
-                for v in inicio_vigencia:
-                    data = v.get('data', 'Data não especificada')
-                    contexto = self._smart_truncate(v.get('contexto', ''), 150)
-                    section += f"   • {data}: {contexto}\n"
+                buckets[_VIGENCIA_BUCKET.get(v.get('tipo', ''), 'outros')].append(v)
             
-            if prazos_aquisicao:
-                section += "\n⏰ PRAZOS-LIMITE PARA OPERAÇÃO:\n"
-                for v in prazos_aquisicao:
-                    data = v.get('data', 'Data não especificada')
-                    contexto = self._smart_truncate(v.get('contexto', ''), 150)
-                    section += f"   • {data}: {contexto}\n"
+            for bucket, title in _VIGENCIA_SECTIONS:
+                if buckets[bucket]:
+                    parts.append(title)
+                    for v in buckets[bucket]:
+                        data = v.get('data', 'Data não especificada')
+                        contexto = _smart_truncate(v.get('contexto', ''), 150)
+                        parts.append(f"   • {data}: {contexto}\n")
             
-            if duracoes_beneficio:
-                section += "\n📆 DURAÇÃO DO BENEFÍCIO / PRAZO DE PERMANÊNCIA:\n"
-                for v in duracoes_beneficio:
-                    data = v.get('data', 'Data não especificada')
-                    contexto = self._smart_truncate(v.get('contexto', ''), 150)
-                    section += f"   • {data}: {contexto}\n"
-            
-            if outros:
-                section += "\n📋 OUTRAS DATAS:\n"
-                for v in outros:
-                    data = v.get('data', 'Data não especificada')
-                    contexto = self._smart_truncate(v.get('contexto', ''), 150)
-                    section += f"   • {data}: {contexto}\n"
-            
-            section += "\n💡 NOTA: Prazo-limite (ex: 31/12/2026) é a data máxima para realizar"
-            section += "\n   a operação. Duração do benefício (ex: 5 anos) é contada a partir"
-            section += "\n   da habilitação no regime especial.\n"
+            parts.append("\n💡 NOTA: Prazo-limite (ex: 31/12/2026) é a data máxima para realizar")
+            parts.append("\n   a operação. Duração do benefício (ex: 5 anos) é contada a partir")
+            parts.append("\n   da habilitação no regime especial.\n")
             
         else:
-            section += "\n⚠️  Datas críticas não identificadas automaticamente."
-            section += "\n   Consulte a legislação para vigências específicas.\n"
+            parts.append("\n⚠️  Datas críticas não identificadas automaticamente.")
+            parts.append("\n   Consulte a legislação para vigências específicas.\n")
         
-        return section
+        return ''.join(parts)
     
     def _build_compliance_risks(self, system_changes: Dict) -> str:
         """Seção de riscos de compliance"""
         risks = system_changes.get('compliance_risks', [])
         
-        section = f"""
+        parts = [f"""
 ================================================================================
 ⚠️  RISCOS DE COMPLIANCE
 ================================================================================
-"""
+"""]
         
         if risks and len(risks) > 0:
-            unique_risks = self._deduplicate_risks(risks)
+            unique_risks = _deduplicate_risks(risks)
             
             for i, risk in enumerate(unique_risks[:6], 1):
-                risk_clean = self._smart_truncate(risk, 200)
-                section += f"\n🔴 RISCO {i}: {risk_clean}\n"
+                risk_clean = _smart_truncate(risk, 200)
+                parts.append(f"\n🔴 RISCO {i}: {risk_clean}\n")
         else:
-            section += "\n⚠️  Riscos de compliance não identificados automaticamente."
-            section += "\n   Recomenda-se análise detalhada da legislação para identificar"
-            section += "\n   requisitos e consequências de descumprimento.\n"
+            parts.append("\n⚠️  Riscos de compliance não identificados automaticamente.")
+            parts.append("\n   Recomenda-se análise detalhada da legislação para identificar")
+            parts.append("\n   requisitos e consequências de descumprimento.\n")
         
-        return section
+        return ''.join(parts)
     
     def _build_cronograma_transicao(self, system_changes: Dict, original_text: str) -> str:
         """
         ✅ v4.8.1 NOVO: Seção de Cronograma de Transição para Reforma Tributária
         """
         # Verifica se é legislação da Reforma Tributária
-        is_reforma = False
-        reforma_keywords = ['ibs', 'cbs', 'imposto seletivo', 'reforma tributária', 'lc 214', 'lei complementar 214']
-        
-        for keyword in reforma_keywords:
-            if keyword in original_text.lower():
-                is_reforma = True
-                break
-        
-        if not is_reforma:
+        if not _REFORMA_RE.search(original_text):
             return ""  # Não exibe seção se não for Reforma Tributária
         
-        section = f"""
-================================================================================
-📅 CRONOGRAMA DE TRANSIÇÃO - REFORMA TRIBUTÁRIA
-================================================================================
-
-A Reforma Tributária estabelece período de transição de 2026 a 2033:
-
-📊 CRONOGRAMA DE ALÍQUOTAS:
-
-| Ano  | CBS (Federal)    | IBS (Est/Mun)    | PIS/COFINS   | ICMS/ISS     |
-|------|------------------|------------------|--------------|--------------|
-| 2026 | 0,9% (teste)     | 0,1% (teste)     | 100%         | 100%         |
-| 2027 | Alíquota cheia   | Aumenta          | Reduz        | 100%         |
-| 2029 | 100%             | Aumenta          | Reduz        | 90%          |
-| 2030 | 100%             | Aumenta          | Reduz        | 80%          |
-| 2031 | 100%             | Aumenta          | Reduz        | 70%          |
-| 2032 | 100%             | Aumenta          | Reduz        | 60%          |
-| 2033 | 100%             | 100%             | EXTINTO      | EXTINTO      |
-
-📌 ALÍQUOTAS DE REFERÊNCIA:
-   • CBS (Contribuição sobre Bens e Serviços): ~8,8%
-   • IBS (Imposto sobre Bens e Serviços): ~17,7%
-   • Total IVA Dual (CBS + IBS): ~26,5%
-
-⚠️  IMPACTO PARA DELL:
-   • Necessidade de atualizar ERP para novos tributos
-   • Período de convivência entre sistemas antigo e novo
-   • Crédito amplo (inclusive serviços) no novo sistema
-   • Cobrança no destino beneficia operações interestaduais
-"""
-        return section
-    
-    def _deduplicate_risks(self, risks: List[str]) -> List[str]:
-        """Remove duplicatas semânticas de riscos"""
-        if not risks:
-            return []
-        
-        concepts = {
-            'incorporacao': [],
-            'alienacao': [],
-            'compromisso': [],
-            'outros': []
-        }
-        
-        for risk in risks:
-            risk_lower = risk.lower()
-            
-            if 'incorporar' in risk_lower or 'ativo' in risk_lower:
-                concepts['incorporacao'].append(risk)
-            elif 'alienar' in risk_lower or '5 anos' in risk_lower:
-                concepts['alienacao'].append(risk)
-            elif 'compromisso' in risk_lower or 'p&d' in risk_lower:
-                concepts['compromisso'].append(risk)
-            else:
-                concepts['outros'].append(risk)
-        
-        unique = []
-        for concept, items in concepts.items():
-            if items:
-                best = max(items, key=len) if len(items) > 1 else items[0]
-                unique.append(best)
-        
-        return unique
+        return _CRONOGRAMA_STATIC
     
     def _build_acoes_requeridas(self, dell_analysis: Dict, system_changes: Dict) -> str:
         """Ações requeridas"""
         acao_raw = dell_analysis.get("acao_requerida", "Não determinada")
-        acao_requerida = self._smart_truncate(acao_raw, 600)
+        acao_requerida = _smart_truncate(acao_raw, 600)
         
         section = f"""
 ================================================================================
@@ -584,16 +722,13 @@ A Reforma Tributária estabelece período de transição de 2026 a 2033:
         raw_text = structured_data.get("raw_extraction", {}).get("raw_text", "")
         
         articles = []
-        art_pattern = r'(Art\.?\s*\d+[A-Z-]*[^\n]{20,300})'
-        matches = re.findall(art_pattern, raw_text, re.IGNORECASE)
-        
-        if matches:
-            for match in matches:
-                if any(keyword in match.lower() for keyword in 
-                       ['suspensão', 'tributo', 'alíquota', 'vigência', 'benefício', 'isenção', 'redata']):
-                    article_clean = self._smart_truncate(match.strip(), 250)
-                    articles.append(f"   {article_clean}")
-                if len(articles) >= 8:
+        # finditer + parada antecipada: não materializa todos os artigos
+        for match in _ART_RE.finditer(raw_text):
+            article = match.group(0)
+            if _ART_KEYWORDS_RE.search(article):
+                article_clean = _smart_truncate(article.strip(), 250)
+                articles.append(f"   {article_clean}")
+                if len(articles) >= MAX_ARTIGOS:
                     break
         
         artigos_text = '\n'.join(articles) if articles else "   Consulte a legislação completa"
@@ -611,116 +746,21 @@ A Reforma Tributária estabelece período de transição de 2026 a 2033:
     
     def _build_fontes(self, web_results: List[Dict]) -> str:
         """Fontes consultadas"""
-        section = f"""
+        parts = [f"""
 ================================================================================
 7️⃣  FONTES CONSULTADAS
 ================================================================================
-"""
+"""]
         
         for i, r in enumerate(web_results[:3], 1):
-            section += f"\n{i}. {r.get('title', 'Sem título')}"
-            section += f"\n   URL: {r.get('url', 'N/A')}"
+            parts.append(f"\n{i}. {r.get('title', 'Sem título')}")
+            parts.append(f"\n   URL: {r.get('url', 'N/A')}")
             if r.get('is_official'):
-                section += f"\n   ✓ Fonte Oficial Governo"
-            section += "\n"
+                parts.append(f"\n   ✓ Fonte Oficial Governo")
+            parts.append("\n")
         
-        return section
+        return ''.join(parts)
     
-    def _assemble_final_report(self, sections: Dict) -> str:
-        """Monta relatório final"""
-        report = sections['header']
-        report += sections['resumo_executivo']
-        report += sections['mudancas_sistema']
-        report += sections['impacto_tributos']
-        report += sections['vigencias']
-        report += sections['compliance_risks']
-        
-        # ✅ v4.8.1: Cronograma de transição (só aparece se for Reforma Tributária)
-        if sections.get('cronograma_transicao'):
-            report += sections['cronograma_transicao']
-        
-        report += sections['acoes_requeridas']
-        report += sections['detalhamento_tecnico']
-        report += sections['fontes']
-        
-        report += f"""
-================================================================================
-⚙️  Sistema: Dell GenAI | Modelo: {MODEL_NAME}
-🗃️  Arquitetura: 13 Agentes Especializados
-🎯 Análise específica para Dell Technologies Brazil
-================================================================================
-"""
-        
-        return report
-    
-    def _clean_field(self, text: str, max_length: int) -> str:
-        """Limpa e trunca campos"""
-        if not text:
-            return text
-        
-        patterns_to_remove = [
-            r'c\)\s*CONDIÇÕES[:\s]*',
-            r'd\)\s*(?:RISCOS?|⚠️)[:\s]*',
-            r'^estabelecidas\.\s*',
-            r'\s+c\)\s*CONDIÇÕES.*$',
-            r'\s+d\)\s*⚠️.*$',
-        ]
-        
-        for pattern in patterns_to_remove:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-        
-        text = ' '.join(text.split())
-        
-        return self._smart_truncate(text, max_length)
-    
-    def _clean_markdown(self, text: str) -> str:
-        """Remove markdown e formatação do texto"""
-        if not text:
-            return text
-        
-        text = re.sub(r'\*\*+', '', text)
-        text = re.sub(r'\*', '', text)
-        text = re.sub(r'__+', '', text)
-        text = re.sub(r'#+\s*', '', text)
-        text = re.sub(r'━+', '', text)
-        text = re.sub(r'─+', '', text)
-        text = re.sub(r'-{3,}', '', text)
-        text = re.sub(r'={3,}', '', text)
-        text = re.sub(r'^\s*[-•]\s*', '', text, flags=re.MULTILINE)
-        text = ' '.join(text.split())
-        
-        return text.strip()
-    
-    def _smart_truncate(self, text: str, max_length: int) -> str:
-        """Trunca texto de forma inteligente"""
-        if not text:
-            return text
-        
-        text = self._clean_markdown(text)
-        text = ' '.join(text.split())
-        
-        if len(text) <= max_length:
-            return text
-        
-        truncated = text[:max_length]
-        
-        last_period = truncated.rfind('.')
-        last_exclamation = truncated.rfind('!')
-        last_question = truncated.rfind('?')
-        last_punct = max(last_period, last_exclamation, last_question)
-        
-        if last_punct > max_length * 0.5:
-            return truncated[:last_punct + 1].strip()
-        
-        last_comma = truncated.rfind(',')
-        last_semicolon = truncated.rfind(';')
-        last_secondary = max(last_comma, last_semicolon)
-        
-        if last_secondary > max_length * 0.7:
-            return truncated[:last_secondary].strip() + '.'
-        
-        last_space = truncated.rfind(' ')
-        if last_space > max_length * 0.5:
-            return truncated[:last_space].strip() + '...'
-        
-        return truncated.strip() + '...'
\ No newline at end of file
+    def _build_footer(self) -> str:
+        """Rodapé do relatório"""
+        return _REPORT_FOOTER
\ No newline at end of file
@@ -8,13 +8,213 @@ CORREÇÃO v4.4:
 - max_tokens já estava em 8000 (OK)
 """
 
-from typing import List, Dict
+from contextlib import closing
+from functools import lru_cache
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 from openai import OpenAI
+import hashlib
 import json
 import re
+import sqlite3
+import time
 from config import *
 
 
+# ============================================================================
+# Padrões regex compilados uma única vez no import
+# ============================================================================
+
+# QuantificationAgent._extract_percentages: "N%" ou "N por cento" numa única varredura.
+# (As antigas variantes "alíquota/redução/aumento ... N%" só reencontravam os mesmos
+# números; o tipo continua vindo do contexto ao redor.)
+_PCT_RE = re.compile(r'(\d+(?:,\d+)?)\s*(?:%|por\s*cento)', re.IGNORECASE)
+_PCT_TRIBUTOS = ("pis", "cofins", "ipi", "icms", "iss")
+
+# FinalAssemblyAgent._identify_legislation_info
+_MP_RE = re.compile(r'MP[vV]?\s*n?º?\s*(\d+)', re.IGNORECASE)
+_LEI_RE = re.compile(r'Lei\s*n?º?\s*([\d.]+)', re.IGNORECASE)
+_DECRETO_RE = re.compile(r'Decreto\s*n?º?\s*([\d.]+)', re.IGNORECASE)
+_PORTARIA_RE = re.compile(r'Portaria\s*n?º?\s*([\d.]+)', re.IGNORECASE)
+_DATE_RE = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')
+
+# (marcadores no título, tipo, regex do número, prefixo do número), em ordem de prioridade:
+# vale o primeiro tipo cujo marcador aparece no título
+_LEGISLATION_KINDS = (
+    (('MP', 'Medida Provisória'), "MEDIDA PROVISÓRIA", _MP_RE, "MP nº "),
+    (('Lei',), "LEI", _LEI_RE, "Lei nº "),
+    (('Decreto',), "DECRETO", _DECRETO_RE, "Decreto nº "),
+    (('Portaria',), "PORTARIA", _PORTARIA_RE, "Portaria nº "),
+)
+
+# FinalAssemblyAgent._extract_summary: linhas lidas sob demanda (sem split do texto todo)
+_LINE_RE = re.compile(r'[^\n]+')
+SUMMARY_MAX_LINES = 10
+SUMMARY_MAX_CHARS = 800
+
+# FinalAssemblyAgent._extract_articles
+_ART_RE = re.compile(r'(Art\.?\s*\d+[A-Z-]*\.?[^\n]{10,200})', re.IGNORECASE)
+MAX_ARTIGOS = 8
+
+# DellRelevanceAgent._extract_relevance_level: rótulo "**RELEVÂNCIA PARA DELL:** X"
+# pedido no DELL_RELEVANCE_PROMPT (busca direta, sem copiar a resposta em maiúsculas)
+_RELEVANCE_LABEL_RE = re.compile(
+    r'RELEV[AÂ]NCIA\s*(?:PARA\s*DELL)?[:*\s]*(ALTA|M[EÉ]DIA|BAIXA)', re.IGNORECASE
+)
+_RELEVANCE_LEVELS = {"ALTA": "ALTA", "MÉDIA": "MÉDIA", "MEDIA": "MÉDIA", "BAIXA": "BAIXA"}
+
+# FinalAssemblyAgent._extract_benefits_obligations / _extract_requirements:
+# frases (até o ponto) contendo cada palavra-chave
+BENEFIT_KEYWORDS = ['suspensão', 'isenção', 'redução', 'benefício', 'alíquota zero',
+                    'crédito', 'desconto']
+REQUIREMENT_KEYWORDS = ['requisito', 'condição', 'desde que', 'quando', 'se', 'deverá']
+MAX_SENTENCES_PER_KEYWORD = 2
+_SENTENCE_RE = re.compile(r'[^.]*\.')
+_ALL_KEYWORDS = tuple(dict.fromkeys(BENEFIT_KEYWORDS + REQUIREMENT_KEYWORDS))
+
+
+@lru_cache(maxsize=8)
+def _keyword_sentences(raw_text: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Primeiras frases de cada palavra-chave (benefícios + requisitos) numa ÚNICA
+    varredura do texto: divide em frases uma vez e testa as palavras na frase em
+    minúsculas. Memorizado: os dois extratores consultam o mesmo raw_text
+    """
+    found = {keyword: [] for keyword in _ALL_KEYWORDS}
+    pending = list(_ALL_KEYWORDS)
+    
+    for match in _SENTENCE_RE.finditer(raw_text):
+        sentence = match.group(0)
+        sentence_lower = sentence.lower()
+        hit = False
+        for keyword in pending:
+            if keyword in sentence_lower:
+                found[keyword].append(sentence)
+                hit = True
+        if hit:
+            pending = [k for k in pending if len(found[k]) < MAX_SENTENCES_PER_KEYWORD]
+            if not pending:
+                break
+    
+    return {keyword: tuple(sentences) for keyword, sentences in found.items()}
+
+
+# ============================================================================
+# Consolidação do conteúdo das fontes (compartilhada pelos agentes)
+# ============================================================================
+
+# Os prompts só usam o início do conteúdo: parar de concatenar ao atingir o limite
+RAW_EXTRACTION_MAX_CHARS = 40000
+IMPACT_ANALYSIS_MAX_CHARS = 35000
+
+
+def _join_bounded(parts: Iterable[str], sep: str, max_chars: Optional[int] = None) -> str:
+    """sep.join(parts)[:max_chars], sem consumir as partes além do limite"""
+    if max_chars is None:
+        return sep.join(parts)
+    
+    taken = []
+    size = 0
+    for part in parts:
+        taken.append(part)
+        size += len(part) + len(sep)
+        if size >= max_chars:
+            break
+    return sep.join(taken)[:max_chars]
+
+
+def _iter_prioritized_content(web_results: List[Dict]) -> Iterator[str]:
+    """
+    Cabeçalho + conteúdo de cada fonte: PDFs primeiro (geralmente são os documentos
+    completos), depois HTML oficial, depois outras fontes. Uma única passada:
+    os PDFs saem direto e as demais fontes ficam só referenciadas até a sua vez
+    """
+    oficiais = []
+    outras = []
+    for r in web_results:
+        if r.get('content_type') == 'pdf':
+            yield f"\n===PDF: {r.get('title')}===\n"
+            yield r.get('content', '')
+        elif r.get('is_official'):
+            oficiais.append(r)
+        else:
+            outras.append(r)
+    
+    for r in oficiais:
+        yield f"\n===OFICIAL: {r.get('title')}===\n"
+        yield r.get('content', '')
+    
+    for r in outras:
+        yield f"\n==={r.get('title')}===\n"
+        yield r.get('content', '')
+
+
+def _consolidate_content(web_results: List[Dict], max_chars: Optional[int] = None) -> str:
+    """Consolida conteúdo priorizando fontes oficiais (até max_chars caracteres)"""
+    return _join_bounded(_iter_prioritized_content(web_results), "\n", max_chars)
+
+
+def _join_contents(web_results: List[Dict], max_chars: Optional[int] = None) -> str:
+    """Consolida conteúdo na ordem das fontes (até max_chars caracteres)"""
+    return _join_bounded((r['content'] for r in web_results if r.get('content')), "\n\n", max_chars)
+
+
+AGENT_SYSTEM_PROMPT = "Você é um especialista em legislação brasileira com foco em análise tributária e corporativa."
+
+
+class LLMResponseCache:
+    """
+    Cache SQLite de respostas do LLM, chave SHA-256 de modelo + temperatura + system + prompt.
+    Os mesmos web_results alimentam vários agentes e reanálises da mesma URL repetem os
+    prompts: um acerto devolve a resposta sem nova chamada.
+    Abre uma conexão por operação, então é seguro entre as threads do app.
+    Entradas expiram após ttl_seconds: ignoradas no get e removidas no put.
+    """
+    
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl_seconds: float = LLM_CACHE_TTL_HOURS * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        with closing(sqlite3.connect(path)) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (prompt_hash TEXT PRIMARY KEY, response TEXT, ts REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_ts ON responses (ts)")
+            conn.commit()
+    
+    @staticmethod
+    def key(model: str, temperature: float, system: str, prompt: str) -> str:
+        text = f"{model}|{temperature}|{system}|{prompt}"
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get(self, prompt_hash: str) -> Optional[str]:
+        with closing(sqlite3.connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT response FROM responses WHERE prompt_hash = ? AND ts >= ?",
+                (prompt_hash, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, prompt_hash: str, response: str):
+        now = time.time()
+        with closing(sqlite3.connect(self.path)) as conn:
+            conn.execute("DELETE FROM responses WHERE ts < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (prompt_hash, response, now)
+            )
+            conn.commit()
+
+
+@lru_cache(maxsize=1)
+def _get_llm_cache() -> Optional[LLMResponseCache]:
+    """Cache compartilhado, criado na primeira chamada (None se LLM_CACHE_PATH vazio ou inacessível)"""
+    if not LLM_CACHE_PATH:
+        return None
+    try:
+        return LLMResponseCache(LLM_CACHE_PATH)
+    except sqlite3.Error as e:
+        print(f"   ⚠️  Cache de LLM desativado: {str(e)}")
+        return None
+
+
 class BaseAgent:
     """Classe base para agentes"""
     
@@ -26,20 +226,39 @@ class BaseAgent:
         self.model = MODEL_NAME
     
     def _call_api(self, prompt: str, temperature: float = 0.1) -> str:
-        """Chama Dell GenAI API"""
+        """Chama Dell GenAI API (com cache exato por prompt)"""
+        cache = _get_llm_cache()
+        prompt_hash = None
+        if cache is not None:
+            prompt_hash = LLMResponseCache.key(self.model, temperature, AGENT_SYSTEM_PROMPT, prompt)
+            try:
+                cached = cache.get(prompt_hash)
+            except sqlite3.Error:
+                cached = None
+            if cached is not None:
+                print("   ♻️  Resposta do LLM em cache")
+                return cached
+        
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "Você é um especialista em legislação brasileira com foco em análise tributária e corporativa."},
+                    {"role": "system", "content": AGENT_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=temperature,
                 max_tokens=8000
             )
-            return response.choices[0].message.content
+            result = response.choices[0].message.content
         except Exception as e:
             raise Exception(f"Erro na API: {str(e)}")
+        
+        if cache is not None and result:
+            try:
+                cache.put(prompt_hash, result)
+            except sqlite3.Error:
+                pass
+        return result
 
 
 class RawExtractionAgent(BaseAgent):
@@ -49,10 +268,10 @@ class RawExtractionAgent(BaseAgent):
         """Extrai dados estruturados de qualquer tipo de legislação"""
         print("   🔄 Extraindo dados estruturados...")
         
-        content = self._consolidate_content(web_results)
+        content = _consolidate_content(web_results, RAW_EXTRACTION_MAX_CHARS)
         
         prompt = GENERIC_EXTRACTION_PROMPT.format(
-            content=content[:40000],
+            content=content,
             query=query
         )
         
@@ -60,36 +279,12 @@ class RawExtractionAgent(BaseAgent):
         
         extracted = {
             "raw_text": result,
-            "content_length": len(content),
+            "content_length": sum(len(r.get('content') or '') for r in web_results),
             "sources_count": len(web_results),
             "legislation_type": legislation_type
         }
         
         return extracted
-    
-    def _consolidate_content(self, web_results: List[Dict]) -> str:
-        """Consolida conteúdo priorizando fontes oficiais"""
-        parts = []
-        
-        # PDFs primeiro (geralmente são os documentos completos)
-        for r in web_results:
-            if r.get('content_type') == 'pdf':
-                parts.append(f"\n===PDF: {r.get('title')}===\n")
-                parts.append(r.get('content', ''))
-        
-        # HTML oficial
-        for r in web_results:
-            if r.get('is_official') and r.get('content_type') != 'pdf':
-                parts.append(f"\n===OFICIAL: {r.get('title')}===\n")
-                parts.append(r.get('content', ''))
-        
-        # Outras fontes
-        for r in web_results:
-            if not r.get('is_official') and r.get('content_type') != 'pdf':
-                parts.append(f"\n==={r.get('title')}===\n")
-                parts.append(r.get('content', ''))
-        
-        return "\n".join(parts)
 
 
 class SectionExtractionAgent(BaseAgent):
@@ -151,7 +346,8 @@ class QuantificationAgent(BaseAgent):
         """Extrai números e percentuais"""
         print("   🔢 Extraindo quantificação...")
         
-        content = self._consolidate_content(web_results)
+        # Conteúdo completo: os percentuais são buscados em todas as fontes
+        content = _join_contents(web_results)
         
         # Regex para números
         percentuais = self._extract_percentages(content)
@@ -174,52 +370,35 @@ class QuantificationAgent(BaseAgent):
         except:
             return "Não foi possível extrair números via LLM"
     
-    def _consolidate_content(self, web_results: List[Dict]) -> str:
-        """Consolida conteúdo"""
-        parts = []
-        for r in web_results:
-            if r.get('content'):
-                parts.append(r['content'])
-        return "\n\n".join(parts)
-    
     def _extract_percentages(self, content: str) -> List[Dict]:
         """Extrai percentuais usando regex"""
         percentuais = []
         
-        patterns = [
-            r'(\d+(?:,\d+)?)\s*%',
-            r'(\d+(?:,\d+)?)\s*por\s*cento',
-            r'alíquota.*?(\d+(?:,\d+)?)\s*%',
-            r'redução.*?(\d+(?:,\d+)?)\s*%',
-            r'aumento.*?(\d+(?:,\d+)?)\s*%',
-        ]
-        
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                try:
-                    valor_str = match.group(1).replace(',', '.')
-                    valor = float(valor_str)
-                    contexto = content[max(0, match.start()-100):min(len(content), match.end()+100)]
-                    
-                    # Determina tipo
-                    tipo = "geral"
-                    if "redução" in contexto.lower() or "reduzir" in contexto.lower():
-                        tipo = "reducao"
-                    elif "aumento" in contexto.lower() or "elevar" in contexto.lower():
-                        tipo = "aumento"
-                    elif "alíquota" in contexto.lower():
-                        tipo = "aliquota"
-                    elif any(t in contexto.lower() for t in ["pis", "cofins", "ipi", "icms", "iss"]):
-                        tipo = "tributo"
-                    
-                    percentuais.append({
-                        "valor": valor,
-                        "contexto": contexto,
-                        "tipo": tipo
-                    })
-                except:
-                    continue
+        for match in _PCT_RE.finditer(content):
+            try:
+                valor_str = match.group(1).replace(',', '.')
+                valor = float(valor_str)
+                contexto = content[max(0, match.start()-100):min(len(content), match.end()+100)]
+                contexto_lower = contexto.lower()
+                
+                # Determina tipo
+                tipo = "geral"
+                if "redução" in contexto_lower or "reduzir" in contexto_lower:
+                    tipo = "reducao"
+                elif "aumento" in contexto_lower or "elevar" in contexto_lower:
+                    tipo = "aumento"
+                elif "alíquota" in contexto_lower:
+                    tipo = "aliquota"
+                elif any(t in contexto_lower for t in _PCT_TRIBUTOS):
+                    tipo = "tributo"
+                
+                percentuais.append({
+                    "valor": valor,
+                    "contexto": contexto,
+                    "tipo": tipo
+                })
+            except:
+                continue
         
         # Remove duplicatas
         seen = set()
@@ -262,22 +441,22 @@ class StructureValidationAgent(BaseAgent):
     def _calculate_completeness(self, data: Dict) -> float:
         """Calcula score de completude"""
         scores = []
+        raw_text = (data.get("raw_extraction") or {}).get("raw_text")
         
         # Verifica conteúdo
-        if data.get("raw_extraction", {}).get("raw_text"):
-            text_len = len(data["raw_extraction"]["raw_text"])
-            scores.append(min(1.0, text_len / 1000))  # Normaliza por tamanho
+        if raw_text:
+            scores.append(min(1.0, len(raw_text) / 1000))  # Normaliza por tamanho
         else:
             scores.append(0.0)
         
         # Verifica datas
-        if data.get("date_extraction", {}).get("vigencias"):
+        if (data.get("date_extraction") or {}).get("vigencias"):
             scores.append(1.0)
         else:
             scores.append(0.3)  # Nem sempre há datas
         
         # Verifica números
-        if data.get("quantification", {}).get("percentuais"):
+        if (data.get("quantification") or {}).get("percentuais"):
             scores.append(1.0)
         else:
             scores.append(0.3)  # Nem sempre há percentuais
@@ -288,13 +467,13 @@ class StructureValidationAgent(BaseAgent):
         """Identifica gaps"""
         gaps = []
         
-        if not data.get("raw_extraction", {}).get("raw_text"):
+        if not (data.get("raw_extraction") or {}).get("raw_text"):
             gaps.append("raw_extraction")
         
-        if not data.get("date_extraction", {}).get("vigencias"):
+        if not (data.get("date_extraction") or {}).get("vigencias"):
             gaps.append("vigencias")
         
-        if not data.get("quantification", {}).get("percentuais"):
+        if not (data.get("quantification") or {}).get("percentuais"):
             gaps.append("percentuais")
         
         return gaps
@@ -332,7 +511,7 @@ class ImpactAnalysisAgent(BaseAgent):
         """Analisa impacto geral da legislação"""
         print("   🎯 Analisando impacto geral...")
         
-        content = self._consolidate_content(web_results)
+        content = _join_contents(web_results, IMPACT_ANALYSIS_MAX_CHARS)
         
         section_agent = SectionExtractionAgent()
         impact = section_agent.extract_impact_analysis(content)
@@ -340,14 +519,6 @@ class ImpactAnalysisAgent(BaseAgent):
         print("      ✓ Análise de impacto concluída")
         
         return impact
-    
-    def _consolidate_content(self, web_results: List[Dict]) -> str:
-        """Consolida conteúdo"""
-        parts = []
-        for r in web_results:
-            if r.get('content'):
-                parts.append(r['content'])
-        return "\n\n".join(parts)
 
 
 class DellRelevanceAgent(BaseAgent):
@@ -389,11 +560,14 @@ class DellRelevanceAgent(BaseAgent):
                                      impact_analysis: Dict) -> str:
         """Prepara resumo da legislação para análise"""
         parts = []
+        raw_text = (structured_data.get("raw_extraction") or {}).get("raw_text")
+        datas = (structured_data.get("date_extraction") or {}).get("llm_analysis")
+        numeros = (structured_data.get("quantification") or {}).get("llm_analysis")
         
         # Extração raw
-        if structured_data.get("raw_extraction", {}).get("raw_text"):
+        if raw_text:
             parts.append("CONTEÚDO PRINCIPAL:")
-            parts.append(structured_data["raw_extraction"]["raw_text"][:5000])
+            parts.append(raw_text[:5000])
         
         # Impacto geral
         if impact_analysis:
@@ -401,19 +575,24 @@ class DellRelevanceAgent(BaseAgent):
             parts.append(impact_analysis.get("raw_analysis", ""))
         
         # Datas
-        if structured_data.get("date_extraction", {}).get("llm_analysis"):
+        if datas:
             parts.append("\n\nDATAS E VIGÊNCIAS:")
-            parts.append(structured_data["date_extraction"]["llm_analysis"][:1000])
+            parts.append(datas[:1000])
         
         # Números
-        if structured_data.get("quantification", {}).get("llm_analysis"):
+        if numeros:
             parts.append("\n\nQUANTIFICAÇÃO:")
-            parts.append(structured_data["quantification"]["llm_analysis"][:1000])
+            parts.append(numeros[:1000])
         
         return "\n".join(parts)
     
     def _extract_relevance_level(self, text: str) -> str:
         """Extrai nível de relevância"""
+        match = _RELEVANCE_LABEL_RE.search(text)
+        if match:
+            return _RELEVANCE_LEVELS[match.group(1).upper()]
+        
+        # Resposta fora do formato: primeiro nível mencionado em qualquer ponto
         text_upper = text.upper()
         if "ALTA" in text_upper:
             return "ALTA"
@@ -506,36 +685,17 @@ class FinalAssemblyAgent(BaseAgent):
         if web_results:
             title = web_results[0].get('title', '')
             
-            # Medida Provisória
-            if 'MP' in title or 'Medida Provisória' in title:
-                tipo = "MEDIDA PROVISÓRIA"
-                mp_match = re.search(r'MP[vV]?\s*n?º?\s*(\d+)', title, re.IGNORECASE)
-                if mp_match:
-                    numero = f"MP nº {mp_match.group(1)}"
-            
-            # Lei
-            elif 'Lei' in title:
-                tipo = "LEI"
-                lei_match = re.search(r'Lei\s*n?º?\s*([\d.]+)', title, re.IGNORECASE)
-                if lei_match:
-                    numero = f"Lei nº {lei_match.group(1)}"
-            
-            # Decreto
-            elif 'Decreto' in title:
-                tipo = "DECRETO"
-                dec_match = re.search(r'Decreto\s*n?º?\s*([\d.]+)', title, re.IGNORECASE)
-                if dec_match:
-                    numero = f"Decreto nº {dec_match.group(1)}"
-            
-            # Portaria
-            elif 'Portaria' in title:
-                tipo = "PORTARIA"
-                port_match = re.search(r'Portaria\s*n?º?\s*([\d.]+)', title, re.IGNORECASE)
-                if port_match:
-                    numero = f"Portaria nº {port_match.group(1)}"
+            # MP / Lei / Decreto / Portaria: uma única busca de número, no padrão do tipo
+            for markers, kind, number_re, prefix in _LEGISLATION_KINDS:
+                if any(marker in title for marker in markers):
+                    tipo = kind
+                    number_match = number_re.search(title)
+                    if number_match:
+                        numero = prefix + number_match.group(1)
+                    break
             
             # Tenta extrair data do título ou conteúdo
-            date_match = re.search(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})', title)
+            date_match = _DATE_RE.search(title)
             if date_match:
                 data = f"{date_match.group(1)}/{date_match.group(2)}/{date_match.group(3)}"
         
@@ -545,12 +705,14 @@ class FinalAssemblyAgent(BaseAgent):
         """Extrai resumo da alteração"""
         raw_text = structured_data.get("raw_extraction", {}).get("raw_text", "")
         if raw_text:
-            # Pega primeiros parágrafos como resumo
-            lines = [l.strip() for l in raw_text.split('\n') if l.strip()]
+            # Pega primeiros parágrafos como resumo, parando no limite
             summary_lines = []
             char_count = 0
-            for line in lines[:10]:  # Máximo 10 linhas
-                if char_count > 800:  # Máximo ~800 caracteres
+            for match in _LINE_RE.finditer(raw_text):
+                line = match.group(0).strip()
+                if not line:
+                    continue
+                if len(summary_lines) >= SUMMARY_MAX_LINES or char_count > SUMMARY_MAX_CHARS:
                     break
                 summary_lines.append(line)
                 char_count += len(line)
@@ -562,13 +724,14 @@ class FinalAssemblyAgent(BaseAgent):
         raw_text = structured_data.get("raw_extraction", {}).get("raw_text", "")
         
         # Procura por artigos no texto
+        # finditer: para de varrer ao atingir o limite de artigos
         articles = []
-        art_pattern = r'(Art\.?\s*\d+[A-Z-]*\.?[^\n]{10,200})'
-        matches = re.findall(art_pattern, raw_text, re.IGNORECASE)
+        for match in _ART_RE.finditer(raw_text):
+            articles.append(f"• {match.group(1).strip()}")
+            if len(articles) >= MAX_ARTIGOS:  # Top 8 artigos
+                break
         
-        if matches:
-            for i, match in enumerate(matches[:8], 1):  # Top 8 artigos
-                articles.append(f"• {match.strip()}")
+        if articles:
             return '\n'.join(articles)
         
         return "Artigos não identificados no formato padrão"
@@ -598,13 +761,10 @@ class FinalAssemblyAgent(BaseAgent):
         
         # Procura por termos-chave
         benefits = []
-        keywords = ['suspensão', 'isenção', 'redução', 'benefício', 'alíquota zero', 
-                   'crédito', 'desconto']
+        sentences = _keyword_sentences(raw_text)
         
-        for keyword in keywords:
-            pattern = rf'[^\.]*{keyword}[^\.]*\.'
-            matches = re.findall(pattern, raw_text, re.IGNORECASE)
-            for match in matches[:2]:  # Máximo 2 por keyword
+        for keyword in BENEFIT_KEYWORDS:
+            for match in sentences[keyword]:  # Máximo 2 por keyword
                 if len(match) > 30 and match not in benefits:
                     benefits.append(f"• {match.strip()}")
         
@@ -619,12 +779,10 @@ class FinalAssemblyAgent(BaseAgent):
         
         # Procura por requisitos
         requirements = []
-        keywords = ['requisito', 'condição', 'desde que', 'quando', 'se', 'deverá']
+        sentences = _keyword_sentences(raw_text)
         
-        for keyword in keywords:
-            pattern = rf'[^\.]*{keyword}[^\.]*\.'
-            matches = re.findall(pattern, raw_text, re.IGNORECASE)
-            for match in matches[:2]:
+        for keyword in REQUIREMENT_KEYWORDS:
+            for match in sentences[keyword]:
                 if len(match) > 30 and len(match) < 300 and match not in requirements:
                     requirements.append(f"• {match.strip()}")
         
@@ -16,11 +16,12 @@ INTEGRAÇÃO:
 from typing import Dict, List, Tuple
 from openai import OpenAI
 import re
-import json
+import orjson
 from config import (
     DEV_GENAI_API_KEY, 
     DEV_GENAI_API_URL, 
-    MODEL_NAME
+    MODEL_NAME,
+    strip_md_fence
 )
 
 
@@ -375,13 +376,10 @@ APENAS JSON, sem explicações."""
                 max_tokens=1500
             )
             
-            result_text = response.choices[0].message.content.strip()
+            # Limpa markdown (cercas ``` e ```json)
+            result_text = strip_md_fence(response.choices[0].message.content)
             
-            # Limpa markdown
-            result_text = re.sub(r'```json\s*', '', result_text)
-            result_text = re.sub(r'```\s*', '', result_text)
-            
-            result = json.loads(result_text)
+            result = orjson.loads(result_text)
             validacoes = result.get("validacoes", [])
             
             # Filtra apenas correções necessárias
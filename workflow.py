@@ -11,6 +11,9 @@ NOVIDADES v5.0:
 - ✅ Fallback automático para LC 214 e outras leis complexas
 """
 
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import TypedDict, List, Dict, Optional
 from langgraph.graph import StateGraph, END
 from web_search_agent import WebSearchAgent
@@ -20,13 +23,23 @@ from system_changes_agent import SystemChangesAgent
 from final_assembly_agent import FinalAssemblyAgent
 from review_agent import ReviewAgent
 
+# Progress messages go through the "workflow" logger so callers (e.g. the web
+# app's SSE stream) can attach their own handlers; console output is unchanged
+logger = logging.getLogger("workflow")
+if not logger.handlers:
+    _console_handler = logging.StreamHandler(sys.stdout)
+    _console_handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_console_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
 # 🆕 v5.0: Importa ValidationAgent
 try:
     from validation_agent import ValidationAgent
     HAS_VALIDATION_AGENT = True
 except ImportError:
     HAS_VALIDATION_AGENT = False
-    print("   ⚠️  ValidationAgent não disponível")
+    logger.info("   ⚠️  ValidationAgent não disponível")
 
 
 class WorkflowState(TypedDict):
@@ -60,13 +73,13 @@ class LegislacaoWorkflow:
     """Workflow com 13 agentes - VERSÃO v5.0 COM VALIDATION AGENT"""
     
     def __init__(self):
-        print("\n🤖 Inicializando Workflow v5.0 - COM VALIDATION AGENT")
-        print("="*80)
-        print("🗃️  Arquitetura: 13 Agentes Especializados")
-        print("🎯 Análise para Dell Technologies Brazil")
-        print("📋 Suporta: Lei, LC, MP, Decreto, Portaria, etc.")
-        print("🆕 v5.0: ValidationAgent para consistência de extrações")
-        print("="*80)
+        logger.info("\n🤖 Inicializando Workflow v5.0 - COM VALIDATION AGENT")
+        logger.info("="*80)
+        logger.info("🗃️  Arquitetura: 13 Agentes Especializados")
+        logger.info("🎯 Análise para Dell Technologies Brazil")
+        logger.info("📋 Suporta: Lei, LC, MP, Decreto, Portaria, etc.")
+        logger.info("🆕 v5.0: ValidationAgent para consistência de extrações")
+        logger.info("="*80)
         
         self.web_search = WebSearchAgent(
             follow_link_depth=1,
@@ -83,17 +96,17 @@ class LegislacaoWorkflow:
         # 🆕 v5.0: Inicializa ValidationAgent
         if HAS_VALIDATION_AGENT:
             self.validation_agent = ValidationAgent()
-            print("   ✅ ValidationAgent carregado")
+            logger.info("   ✅ ValidationAgent carregado")
         else:
             self.validation_agent = None
-            print("   ⚠️  ValidationAgent não disponível")
+            logger.info("   ⚠️  ValidationAgent não disponível")
         
         self.dell_relevance = DellRelevanceAgent()
         self.review_agent = ReviewAgent()
         self.final_assembly = FinalAssemblyAgent()
         
         self.workflow = self._build_workflow()
-        print("✅ Workflow v5.0 pronto\n")
+        logger.info("✅ Workflow v5.0 pronto\n")
     
     def _build_workflow(self) -> StateGraph:
         """Constrói pipeline com 13 agentes"""
@@ -143,7 +156,7 @@ class LegislacaoWorkflow:
     
     def process_input(self, state: WorkflowState) -> WorkflowState:
         """Agente 1: Processamento de input"""
-        print("\n📥 AGENTE 1: Input Processing")
+        logger.info("\n📥 AGENTE 1: Input Processing")
         # Inicializa campos
         state["known_law_key"] = None
         state["validation_status"] = None  # 🆕 v5.0
@@ -151,7 +164,7 @@ class LegislacaoWorkflow:
     
     def search_web(self, state: WorkflowState) -> WorkflowState:
         """Agente 2: Web Search"""
-        print("\n🔍 AGENTE 2: Web Search")
+        logger.info("\n🔍 AGENTE 2: Web Search")
         urls = state.get("urls", [])
         
         if urls:
@@ -160,12 +173,12 @@ class LegislacaoWorkflow:
             results = self.web_search.search(state["query"], max_results=15)
         
         state["web_results"] = results
-        print(f"   ✅ {len(results)} fontes extraídas")
+        logger.info(f"   ✅ {len(results)} fontes extraídas")
         return state
     
     def detect_type(self, state: WorkflowState) -> WorkflowState:
         """Agente 3: Type Detection"""
-        print("\n🔎 AGENTE 3: Legislation Type Detection")
+        logger.info("\n🔎 AGENTE 3: Legislation Type Detection")
         
         if state["web_results"]:
             first = state["web_results"][0]
@@ -178,7 +191,7 @@ class LegislacaoWorkflow:
                 leg_type = "default"
             
             state["legislation_type"] = leg_type
-            print(f"   📋 Tipo identificado: {leg_type}")
+            logger.info(f"   📋 Tipo identificado: {leg_type}")
             
             # Tenta detectar lei conhecida
             try:
@@ -186,33 +199,39 @@ class LegislacaoWorkflow:
                 known_key = detect_known_legislation(url, content, first.get("title", ""))
                 if known_key:
                     state["known_law_key"] = known_key
-                    print(f"   📚 Lei conhecida detectada: {known_key}")
+                    logger.info(f"   📚 Lei conhecida detectada: {known_key}")
             except ImportError:
                 pass
         else:
             state["legislation_type"] = "default"
-            print(f"   ⚠️  Sem resultados, usando tipo padrão")
+            logger.info(f"   ⚠️  Sem resultados, usando tipo padrão")
         
         return state
     
     def extract_raw(self, state: WorkflowState) -> WorkflowState:
-        """Agente 4: Raw Extraction"""
-        print("\n📊 AGENTE 4: Raw Extraction")
-        
-        raw = self.raw_extraction.extract(
-            state["web_results"],
-            state["query"],
-            state["legislation_type"]
-        )
+        """Agente 4: Raw Extraction (Agente 6 - Quantification - em paralelo)"""
+        logger.info("\n📊 AGENTE 4: Raw Extraction")
+        
+        # Quantification só depende de web_results: sua chamada LLM roda numa thread
+        # enquanto a extração bruta espera a dela (I/O de rede, libera o GIL), então
+        # as duas latências se sobrepõem em vez de somar
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="quantification") as pool:
+            quant_future = pool.submit(self.quantification.extract, state["web_results"], {})
+            raw = self.raw_extraction.extract(
+                state["web_results"],
+                state["query"],
+                state["legislation_type"]
+            )
+            state["quantification"] = quant_future.result()
         state["raw_extraction"] = raw
         
         text_len = len(raw.get("raw_text", ""))
-        print(f"   ✅ Extraído: {text_len:,} caracteres")
+        logger.info(f"   ✅ Extraído: {text_len:,} caracteres")
         return state
     
     def extract_dates(self, state: WorkflowState) -> WorkflowState:
         """Agente 5: Date Extraction"""
-        print("\n📅 AGENTE 5: Date Extraction")
+        logger.info("\n📅 AGENTE 5: Date Extraction")
         
         dates = self.date_extraction.extract(
             state["web_results"],
@@ -223,29 +242,32 @@ class LegislacaoWorkflow:
         # Atualiza known_law_key se o agente detectou
         if dates.get("known_law_key") and not state.get("known_law_key"):
             state["known_law_key"] = dates["known_law_key"]
-            print(f"   📚 Lei conhecida detectada pelo DateExtraction: {dates['known_law_key']}")
+            logger.info(f"   📚 Lei conhecida detectada pelo DateExtraction: {dates['known_law_key']}")
         
         count = len(dates.get("vigencias", []))
-        print(f"   ✅ {count} vigências extraídas")
+        logger.info(f"   ✅ {count} vigências extraídas")
         return state
     
     def extract_numbers(self, state: WorkflowState) -> WorkflowState:
         """Agente 6: Quantification"""
-        print("\n🔢 AGENTE 6: Quantification")
+        logger.info("\n🔢 AGENTE 6: Quantification")
         
-        quant = self.quantification.extract(
-            state["web_results"],
-            state["raw_extraction"]
-        )
-        state["quantification"] = quant
+        # Normalmente já calculado em paralelo com a extração bruta (extract_raw)
+        quant = state.get("quantification")
+        if quant is None:
+            quant = self.quantification.extract(
+                state["web_results"],
+                state["raw_extraction"]
+            )
+            state["quantification"] = quant
         
         pcts = len(quant.get("percentuais", []))
-        print(f"   ✅ {pcts} valores quantitativos encontrados")
+        logger.info(f"   ✅ {pcts} valores quantitativos encontrados")
         return state
     
     def validate(self, state: WorkflowState) -> WorkflowState:
         """Agente 7: Validation"""
-        print("\n✅ AGENTE 7: Structure Validation")
+        logger.info("\n✅ AGENTE 7: Structure Validation")
         
         structured, validation = self.structure_validation.process(
             state["raw_extraction"],
@@ -258,13 +280,13 @@ class LegislacaoWorkflow:
         state["validation_results"] = validation
         
         score = validation["completeness_score"] * 100
-        print(f"   📊 Completude: {score:.1f}%")
+        logger.info(f"   📊 Completude: {score:.1f}%")
         
         return state
     
     def enhance(self, state: WorkflowState) -> WorkflowState:
         """Agente 8: Enhancement"""
-        print("\n🔧 AGENTE 8: Data Enhancement")
+        logger.info("\n🔧 AGENTE 8: Data Enhancement")
         
         enhanced = self.enhancement.enhance(
             state["structured_data"],
@@ -272,12 +294,12 @@ class LegislacaoWorkflow:
             state["web_results"]
         )
         state["enhanced_data"] = enhanced
-        print("   ✅ Enhancement aplicado")
+        logger.info("   ✅ Enhancement aplicado")
         return state
     
     def analyze_impact(self, state: WorkflowState) -> WorkflowState:
         """Agente 9: Impact Analysis"""
-        print("\n🎯 AGENTE 9: Impact Analysis")
+        logger.info("\n🎯 AGENTE 9: Impact Analysis")
         
         data = state.get("enhanced_data") or state["structured_data"]
         
@@ -286,12 +308,12 @@ class LegislacaoWorkflow:
             state["web_results"]
         )
         state["impact_analysis"] = impact
-        print("   ✅ Análise de impacto concluída")
+        logger.info("   ✅ Análise de impacto concluída")
         return state
     
     def analyze_system_changes(self, state: WorkflowState) -> WorkflowState:
         """Agente 10: System Changes Analysis"""
-        print("\n⚙️  AGENTE 10: System Changes Analysis")
+        logger.info("\n⚙️  AGENTE 10: System Changes Analysis")
         
         data = state.get("enhanced_data") or state["structured_data"]
         
@@ -307,7 +329,7 @@ class LegislacaoWorkflow:
         if changes.get("known_law_key") and not state.get("known_law_key"):
             state["known_law_key"] = changes["known_law_key"]
         
-        print("   ✅ Mudanças no sistema identificadas")
+        logger.info("   ✅ Mudanças no sistema identificadas")
         return state
     
     def run_validation(self, state: WorkflowState) -> WorkflowState:
@@ -318,14 +340,14 @@ class LegislacaoWorkflow:
         if self.validation_agent:
             state = self.validation_agent.validate(state)
         else:
-            print("\n🔍 AGENTE 11: Validation Agent")
-            print("   ⚠️  ValidationAgent não disponível, pulando validação")
+            logger.info("\n🔍 AGENTE 11: Validation Agent")
+            logger.info("   ⚠️  ValidationAgent não disponível, pulando validação")
         
         return state
     
     def dell_relevance_check(self, state: WorkflowState) -> WorkflowState:
         """Agente 12: Dell Relevance Analysis"""
-        print("\n🏢 AGENTE 12: Dell Relevance Analysis")
+        logger.info("\n🏢 AGENTE 12: Dell Relevance Analysis")
         
         data = state.get("enhanced_data") or state["structured_data"]
         
@@ -337,7 +359,7 @@ class LegislacaoWorkflow:
         state["dell_analysis"] = dell_analysis
         
         relevance = dell_analysis.get("relevancia", "NÃO DETERMINADA")
-        print(f"   ✅ Relevância Dell: {relevance}")
+        logger.info(f"   ✅ Relevância Dell: {relevance}")
         return state
     
     def review_outputs(self, state: WorkflowState) -> WorkflowState:
@@ -346,7 +368,7 @@ class LegislacaoWorkflow:
     
     def assemble(self, state: WorkflowState) -> WorkflowState:
         """Agente 13: Montagem final do relatório"""
-        print("\n📝 AGENTE 13: Final Assembly (v5.0)")
+        logger.info("\n📝 AGENTE 13: Final Assembly (v5.0)")
         
         data = state.get("enhanced_data") or state["structured_data"]
         
@@ -367,14 +389,14 @@ class LegislacaoWorkflow:
         
         state["final_analysis"] = report
         state["workflow_complete"] = True
-        print("   ✅ Relatório estruturado gerado (v5.0)")
+        logger.info("   ✅ Relatório estruturado gerado (v5.0)")
         return state
     
     def run(self, query: str = None, url: str = None, urls: List[str] = None) -> Dict:
         """Executa workflow completo"""
-        print("\n" + "="*80)
-        print("🚀 WORKFLOW v5.0 - COM VALIDATION AGENT")
-        print("="*80)
+        logger.info("\n" + "="*80)
+        logger.info("🚀 WORKFLOW v5.0 - COM VALIDATION AGENT")
+        logger.info("="*80)
         
         url_list = urls or ([url] if url else [])
         
@@ -406,10 +428,10 @@ class LegislacaoWorkflow:
         
         final = self.workflow.invoke(state)
         
-        print("\n" + "="*80)
-        print("✅ WORKFLOW v5.0 CONCLUÍDO")
+        logger.info("\n" + "="*80)
+        logger.info("✅ WORKFLOW v5.0 CONCLUÍDO")
         if final.get("known_law_key"):
-            print(f"📚 Knowledge Base utilizado: {final['known_law_key']}")
+            logger.info(f"📚 Knowledge Base utilizado: {final['known_law_key']}")
         
         # 🆕 v5.0: Mostra status da validação
         validation_status = final.get("validation_status", {})
@@ -417,9 +439,9 @@ class LegislacaoWorkflow:
             corrections = validation_status.get("corrections_made", 0)
             confidence = validation_status.get("confidence", "N/A")
             if corrections > 0:
-                print(f"🔧 Correções aplicadas: {corrections}")
-            print(f"📊 Confiança: {confidence}")
+                logger.info(f"🔧 Correções aplicadas: {corrections}")
+            logger.info(f"📊 Confiança: {confidence}")
         
-        print("="*80)
+        logger.info("="*80)
         
         return final
\ No newline at end of file